@@ -1,54 +1,159 @@
+from __future__ import annotations
+
+import collections
+import concurrent.futures
+import functools
 import os
+import stat
 import threading
 import time
 import tkinter as tk
 from tkinter import filedialog, ttk, messagebox
+from tkinter import font as tkfont
+from typing import TYPE_CHECKING
 
-import numpy as np
-
-# Try to import sounddevice for device listing
-try:
-    import sounddevice as sd
-except Exception:
-    sd = None
-
-from analysis import attack_release, compare, compressor, thd, live_measurements
-from audio import devices, playrec, wav_io
+# numpy, sounddevice, matplotlib and the analysis/audio packages are imported
+# inside the handlers that need them so the window shows up without paying for
+# them at start-up; repeated imports are just a sys.modules lookup.
 from utils.logging import UILogger
-from utils.plot_windows import PlotWindowManager
-from utils.threading import run_in_thread
+
+if TYPE_CHECKING:
+    import numpy as np
 
 # ============================================================
 # CONSTANTS
 # ============================================================
 BASE_DIR = os.path.dirname(os.path.abspath(__file__)) if '__file__' in locals() else os.getcwd()
 ACCENT = '#0b66c3'
-BTN_FONT = (None, 10, 'bold')
-LOG_FONT = ('Consolas', 10)
+# Named-font options; the Font objects are created once a Tk root exists
+BTN_FONT = {'name': 'btnfont', 'size': 10, 'weight': 'bold'}
+LOG_FONT = {'name': 'logfont', 'family': 'Consolas', 'size': 10}
+DEVICES_PLACEHOLDER = "Loading devices…"
+UI_PUMP_MS = 5  # Tk-side poll interval for worker callbacks while a task runs
+TASK_WORKERS = 2  # pooled task threads; analyses may overlap, HW runs never do
+LOG_FLUSH_MS = 100  # queued log lines are written to the widget at most this often
+LOG_QUEUE_MAX = 5000  # pending lines kept if the UI falls behind (oldest dropped)
+LOG_MAX_LINES = 10000  # the log widget is trimmed from the top beyond this
+STIMULUS_CACHE_SIZE = 8  # prepared test tones kept for repeat measurements
+WAV_CACHE_SIZE = 4  # decoded analysis files kept while unchanged on disk
+
+
+def _load_sounddevice():
+    """Return the sounddevice module, or None when it is not available."""
+    from audio import devices
+
+    return devices.sd
+
+
+def _named_font(root, name, **options):
+    """Create (or reconfigure) a named Tk font shared by every widget using it."""
+    if name in tkfont.names(root):
+        font = tkfont.Font(root=root, name=name, exists=True)
+        font.configure(**options)
+        return font
+    return tkfont.Font(root=root, name=name, **options)
+
+
+@functools.lru_cache(maxsize=8)
+def _fade_window(fade):
+    """Read-only float32 linear fade-in ramp of ``fade`` samples (cached)."""
+    import numpy as np
+
+    window = np.linspace(0, 1, fade, dtype=np.float32)
+    window.setflags(write=False)
+    return window
+
 
 # ============================================================
 # Scrollable Frame Class (LEFT PANEL)
 # ============================================================
 class ScrollableFrame(ttk.Frame):
+    """Vertical stack of rows placed on a scrolling canvas via ``create_window``.
+
+    Row heights are tracked from their ``<Configure>`` events and the
+    scrollregion is grown incrementally, so it never needs a canvas scan.
+    """
+
     def __init__(self, container):
         super().__init__(container)
 
         canvas = tk.Canvas(self, borderwidth=0, background="#fafafa")
         scrollbar = ttk.Scrollbar(self, orient="vertical", command=canvas.yview)
-        self.scrollable_frame = ttk.Frame(canvas)
-
-        self.scrollable_frame.bind(
-            "<Configure>",
-            lambda e: canvas.configure(scrollregion=canvas.bbox("all"))
-        )
+        self._rows = []  # [canvas item, widget, padx, current height]
+        self._content_width = 0
+        self._content_height = 0
 
-        canvas.create_window((0, 0), window=self.scrollable_frame, anchor="nw")
         canvas.configure(yscrollcommand=scrollbar.set)
 
         canvas.pack(side="left", fill="both", expand=True)
         scrollbar.pack(side="right", fill="y")
 
         self.canvas = canvas
+        self.scrollable_frame = canvas
+
+        # One global wheel binding, active only while the pointer is over the
+        # panel, instead of binding every row widget.
+        canvas.bind("<Enter>", self._activate_wheel)
+        canvas.bind("<Leave>", self._deactivate_wheel)
+
+    def _activate_wheel(self, _event=None):
+        self.canvas.bind_all("<MouseWheel>", self._on_wheel)
+        self.canvas.bind_all("<Button-4>", self._on_wheel)
+        self.canvas.bind_all("<Button-5>", self._on_wheel)
+
+    def _deactivate_wheel(self, event):
+        # Entering a row widget also fires <Leave> on the canvas; keep the
+        # binding while the pointer is still inside the panel.
+        inside = str(self.winfo_containing(event.x_root, event.y_root) or "")
+        root = str(self.canvas)
+        if inside == root or inside.startswith(root + "."):
+            return
+        self.canvas.unbind_all("<MouseWheel>")
+        self.canvas.unbind_all("<Button-4>")
+        self.canvas.unbind_all("<Button-5>")
+
+    def _on_wheel(self, event):
+        if event.num == 4:
+            step = -1
+        elif event.num == 5:
+            step = 1
+        elif event.delta:
+            # Windows reports multiples of 120, macOS small deltas
+            step = int(-event.delta / 120) or (-1 if event.delta > 0 else 1)
+        else:
+            return
+        self.canvas.yview_scroll(step, "units")
+
+    def add_row(self, widget, padx=0, pady=0):
+        """Append ``widget`` below the previous row (like ``pack(fill="x")``)."""
+        y = self._content_height + pady
+        item = self.canvas.create_window((padx, y), window=widget, anchor="nw")
+        index = len(self._rows)
+        self._rows.append([item, widget, padx, 0])
+        widget.bind("<Configure>", lambda e, i=index: self._on_row_configure(i, e), add="+")
+        self.notify_row_added(2 * pady)
+
+    def notify_row_added(self, height):
+        """Grow the content height by ``height`` pixels and update the scrollregion."""
+        self._content_height += height
+        self.canvas.configure(scrollregion=(0, 0, self._content_width, self._content_height))
+
+    def _on_row_configure(self, index, event):
+        _, widget, padx, old_height = self._rows[index]
+        width = widget.winfo_reqwidth() + 2 * padx
+        widened = width > self._content_width
+        if widened:
+            # Rows share the widest row's width, as pack(fill="x") did
+            self._content_width = width
+            for row_item, _, row_padx, _ in self._rows:
+                self.canvas.itemconfigure(row_item, width=width - 2 * row_padx)
+        delta = event.height - old_height
+        if delta:
+            self._rows[index][3] = event.height
+            for later in self._rows[index + 1:]:
+                self.canvas.move(later[0], 0, delta)
+        if delta or widened:
+            self.notify_row_added(delta)
 
 
 # ============================================================
@@ -60,38 +165,73 @@ class AudioAnalysisToolkitApp:
         master.title("Audio Analysis Suite v3.4 – UI Upgraded")
         master.geometry("1400x900")
 
-        # Variables
-        self.hw_freq = tk.StringVar(value='1000')
-        self.hw_amp = tk.StringVar(value='0.7')
+        # Variables. Plain numeric fields are ttk.Entry widgets read once per
+        # measurement (see _value_entry); StringVars are kept only where the
+        # value is set programmatically or shared between widgets.
         self.hw_input_dev = tk.StringVar()
         self.hw_output_dev = tk.StringVar()
         self.hw_loop_file = tk.StringVar(value='')
-        self.hw_ar_rms_win = tk.StringVar(value='5')
-        self.hw_thd_hmax = tk.StringVar(value='5')
-        self.thd_max_h = tk.StringVar(value='5')
+        self.hw_ar_rms_win = tk.StringVar(value='5')  # mirrored by the C and D sections
         self.offline_in = tk.StringVar(value='')
         self.offline_out = tk.StringVar(value='')
 
         self.state = {'input_file': '', 'received_file': ''}
         self.stop_event = threading.Event()
-        self.worker = None
+        self._jit_ready = threading.Event()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=TASK_WORKERS, thread_name_prefix="audio_ui"
+        )
+        self._hw_lock = threading.Lock()  # one soundcard measurement at a time
+        self._ui_calls = collections.deque()
+        self._ui_pump_job = None
+        self._ui_producers = []
+        self._devices_ready = threading.Event()
+        self._refresh_in_flight = False
         self._last_input_devices = []
         self._last_output_devices = []
+        self._last_input_set = frozenset()
+        self._last_output_set = frozenset()
+        self._device_counts = (0, 0)
         self._devices_signature = None
+        self._device_cache = {}
+        self._stimulus_cache = collections.OrderedDict()
+        self._wav_cache = {}
+        self._wav_cache_lock = threading.Lock()  # analyses can run concurrently
+        self._align_cache = None
         self._auto_refresh_job = None
+        self._next_tick_deadline = 0.0
         self.auto_refresh_interval_ms = 8000
         self.auto_refresh_enabled = tk.BooleanVar(value=False)
-        self.logger = UILogger(self.hw_log)
-        self.plot_manager = PlotWindowManager(master, log=self.hw_log)
+        self._tk_thread = threading.current_thread()
+        self.logger = UILogger(
+            self._append_log, schedule=self._schedule_log_flush, timestamps=True, maxlen=LOG_QUEUE_MAX
+        )
+        self._plot_manager = None
+        self._plot_lock = threading.Lock()
+        self._pending_plots = {}
 
         self._configure_style()
         self._build_ui()
-        self._refresh_hw_devices()
+        self._load_devices_async()
+        master.after(100, self._warmup_jit)
+        master.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    @property
+    def plot_manager(self):
+        # matplotlib is only loaded once the first snapshot is requested
+        if self._plot_manager is None:
+            from utils.plot_windows import PlotWindowManager
+
+            self._plot_manager = PlotWindowManager(self.master, log=self.hw_log)
+        return self._plot_manager
 
     # ---------------------------------------------------------
     # STYLE
     # ---------------------------------------------------------
     def _configure_style(self):
+        self.btn_font = _named_font(self.master, **BTN_FONT)
+        self.log_font = _named_font(self.master, **LOG_FONT)
+
         style = ttk.Style()
         style.theme_use("clam")
 
@@ -100,23 +240,53 @@ class AudioAnalysisToolkitApp:
         style.configure("TLabelframe.Label", background="#fafafa", foreground=ACCENT, font=('Segoe UI', 11, 'bold'))
         style.configure("TLabel", background="#fafafa", font=('Segoe UI', 10))
         style.configure("TEntry", padding=4)
-        style.configure("Accent.TButton", foreground="white", background=ACCENT, font=BTN_FONT)
+        style.configure("Accent.TButton", foreground="white", background=ACCENT, font=self.btn_font)
         style.map("Accent.TButton", background=[("active", "#094f99")])
 
     # ---------------------------------------------------------
     # LOG
     # ---------------------------------------------------------
     def hw_log(self, msg):
-        self.log_text.insert(tk.END, msg + "\n")
+        self.logger.log(msg)
+
+    def _schedule_log_flush(self, flush):
+        # Tk is not thread-safe: a worker's first queued line hops onto the UI
+        # pump, and only the Tk thread arms the timer. Everything logged within
+        # LOG_FLUSH_MS is then written as one widget update.
+        if threading.current_thread() is not self._tk_thread:
+            self._post_ui(self._schedule_log_flush, flush)
+            return
+        self.master.after(LOG_FLUSH_MS, flush)
+
+    def _append_log(self, text):
+        # One insert/see per flushed batch rather than per line
+        self.log_text.insert(tk.END, text + "\n")
+        lines = int(self.log_text.index("end-1c").split(".")[0])
+        if lines > LOG_MAX_LINES:
+            self.log_text.delete("1.0", f"{lines - LOG_MAX_LINES}.0")
         self.log_text.see(tk.END)
 
     # ---------------------------------------------------------
-    def _start_thread(self, target, name=None):
-        if self.worker and self.worker.is_alive():
+    def _start_thread(self, target, name=None, hw=False):
+        """Run ``target`` on the task pool.
+
+        ``hw`` tasks drive the soundcard and are serialised by ``_hw_lock``;
+        a second one is refused while one is running. File analyses may run
+        alongside them or each other.
+        """
+        if hw and self._hw_lock.locked():
             self.hw_log("Một tác vụ khác đang chạy. Vui lòng chờ...")
             return
+
         def wrapped():
+            if hw and not self._hw_lock.acquire(blocking=False):
+                self.hw_log("Một tác vụ khác đang chạy. Vui lòng chờ...")
+                return
             try:
+                # Only blocks if the task arrives before start-up (JIT warm-up,
+                # device enumeration) has finished
+                self._jit_ready.wait()
+                self._devices_ready.wait()
                 target()
             except Exception as exc:
                 import traceback
@@ -124,22 +294,119 @@ class AudioAnalysisToolkitApp:
                 self.hw_log(f"[{name or target.__name__}] lỗi: {exc}")
                 for line in traceback.format_exc().strip().splitlines():
                     self.hw_log(line)
+            finally:
+                if hw:
+                    self._hw_lock.release()
+
+        if hw:
+            self.stop_event.clear()
+        self._watch_thread(self._executor.submit(wrapped))
+
+    def _on_close(self):
+        self.stop_event.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.master.destroy()
+
+    def _warmup_jit(self):
+        def warmup():
+            try:
+                from analysis import jit
+
+                jit.warmup()
+            except Exception as exc:
+                self.hw_log(f"JIT warm-up lỗi: {exc}")
+            finally:
+                self._jit_ready.set()
 
-        self.worker = run_in_thread(wrapped, self.stop_event, name=name)
+        thread = threading.Thread(target=warmup, name="jit_warmup", daemon=True)
+        thread.start()
+        self._watch_thread(thread)
 
     def request_stop(self):
         self.stop_event.set()
 
-    def _schedule_plot(self, func, *args, **kwargs):
-        if self.master:
-            self.master.after(0, lambda: func(*args, **kwargs))
+    def _post_ui(self, func, *args, **kwargs):
+        """Queue ``func`` for the Tk thread; safe to call from worker threads.
+
+        The pump is armed here as well, so callers need not be registered
+        with ``_watch_thread`` (CSV/WAV writer threads, background pools).
+        """
+        self._ui_calls.append((func, args, kwargs))
+        if threading.current_thread() is self._tk_thread:
+            self._arm_ui_pump()
+            return
+        try:
+            # ``after`` is the one Tk call that is safe from another thread
+            self.master.after(0, self._arm_ui_pump)
+        except (RuntimeError, tk.TclError):
+            pass  # main loop gone (shutting down)
+
+    def _watch_thread(self, producer):
+        """Keep the UI pump running while ``producer`` may still post callbacks.
+
+        ``producer`` is a ``threading.Thread`` or a task-pool ``Future``.
+        """
+        self._ui_producers = [p for p in self._ui_producers if self._producer_alive(p)]
+        self._ui_producers.append(producer)
+        self._arm_ui_pump()
+
+    @staticmethod
+    def _producer_alive(producer) -> bool:
+        if isinstance(producer, concurrent.futures.Future):
+            return not producer.done()
+        return producer.is_alive()
+
+    def _arm_ui_pump(self):
+        if self._ui_pump_job is None and self.master:
+            self._ui_pump_job = self.master.after(0, self._pump_ui)
+
+    def _pump_ui(self):
+        # Poll every UI_PUMP_MS only while a watched thread can still post
+        # callbacks; once all have finished and the queue is drained the pump
+        # goes idle.
+        self._ui_pump_job = None
+        busy = any(self._producer_alive(p) for p in self._ui_producers)
+        while self._ui_calls:
+            func, args, kwargs = self._ui_calls.popleft()
+            try:
+                func(*args, **kwargs)
+            except Exception as exc:
+                self.hw_log(f"[UI] lỗi: {exc}")
+        if busy or self._ui_calls:
+            self._ui_pump_job = self.master.after(UI_PUMP_MS, self._pump_ui)
+
+    def _schedule_plot(self, kind, *args, **kwargs):
+        # Coalesce snapshot requests: only the newest call per plot kind is
+        # drawn, all in a single drain on the Tk thread.  ``kind`` names a
+        # PlotWindowManager method; the manager itself is only resolved in
+        # the drain, so worker threads never construct it.
+        with self._plot_lock:
+            first = not self._pending_plots
+            self._pending_plots[kind] = (args, kwargs)
+        if first:
+            self._post_ui(self._drain_plots)
+
+    def _drain_plots(self):
+        with self._plot_lock:
+            pending, self._pending_plots = self._pending_plots, {}
+        for kind, (args, kwargs) in pending.items():
+            try:
+                getattr(self.plot_manager, kind)(*args, **kwargs)
+            except Exception as exc:
+                self.hw_log(f"[Plot] lỗi: {exc}")
 
     def _require_sounddevice(self):
-        if sd is None:
+        if _load_sounddevice() is None:
             messagebox.showerror("Sounddevice", "Sounddevice không khả dụng. Cài đặt thư viện trước khi đo HW.")
             return False
         return True
 
+    def _value_entry(self, parent, default, width):
+        """Entry pre-filled with ``default``, without a Tcl variable trace."""
+        entry = ttk.Entry(parent, width=width)
+        entry.insert(0, default)
+        return entry
+
     def _parse_float(self, var, default=0.0):
         try:
             return float(var.get())
@@ -155,96 +422,165 @@ class AudioAnalysisToolkitApp:
     # ---------------------------------------------------------
     # DEVICE REFRESH
     # ---------------------------------------------------------
+    def _enumerate_devices_worker(self, known_signature, fresh: bool = False):
+        """Query PortAudio off the Tk thread.
+
+        Returns ``(raw_devices, inputs, outputs, signature)``, or None when the
+        device signature still equals ``known_signature``. ``fresh`` skips the
+        short-lived enumeration cache (manual refresh).
+        """
+        from audio import devices
+
+        if fresh:
+            devices.invalidate_device_cache()
+        # A single PortAudio enumeration feeds the signature and both lists
+        raw_devices = devices.cached_query_devices()
+        signature = devices.devices_signature(raw_devices)
+        if signature == known_signature:
+            return None
+        inputs, outputs = devices.split_devices(raw_devices)
+        return raw_devices, inputs, outputs, signature
+
+    def _load_devices_async(self):
+        # The comboboxes show a placeholder until the first enumeration is done
+        self.cb_in.set(DEVICES_PLACEHOLDER)
+        self.cb_out.set(DEVICES_PLACEHOLDER)
+        self._start_device_refresh()
+
     def _refresh_hw_devices(self, from_timer: bool = False):
         if self.master and threading.current_thread() is not threading.main_thread():
             self.master.after(0, lambda: self._refresh_hw_devices(from_timer=from_timer))
             return
+        self._start_device_refresh(from_timer=from_timer)
 
-        if sd is None:
-            self.hw_log("Sounddevice không khả dụng.")
+    def _start_device_refresh(self, from_timer: bool = False):
+        # Enumeration (and, the first time, the PortAudio dlopen) runs on a
+        # worker; overlapping requests are dropped while one is in flight.
+        if self._refresh_in_flight:
             return
+        self._refresh_in_flight = True
+        known_signature = self._devices_signature
+
+        def worker():
+            result = error = None
+            try:
+                if _load_sounddevice() is None:
+                    error = "Sounddevice không khả dụng."
+                else:
+                    result = self._enumerate_devices_worker(known_signature, fresh=not from_timer)
+            except Exception as e:
+                error = f"Lỗi khi lấy thiết bị: {e}"
+            self._post_ui(self._apply_device_refresh, result, error, from_timer)
+
+        thread = threading.Thread(target=worker, name="devices_refresh", daemon=True)
+        thread.start()
+        self._watch_thread(thread)
+
+    def _apply_device_refresh(self, result, error, from_timer: bool = False):
         try:
-            raw_devices = sd.query_devices()
-            inputs, outputs = devices.list_devices(raise_on_error=True)
-
-            in_count = sum(1 for d in raw_devices if d.get('max_input_channels', 0) > 0)
-            out_count = sum(1 for d in raw_devices if d.get('max_output_channels', 0) > 0)
-
-            prev_in_sel = self.hw_input_dev.get()
-            prev_out_sel = self.hw_output_dev.get()
-
-            added_in = [d for d in inputs if d not in self._last_input_devices]
-            removed_in = [d for d in self._last_input_devices if d not in inputs]
-            added_out = [d for d in outputs if d not in self._last_output_devices]
-            removed_out = [d for d in self._last_output_devices if d not in outputs]
-
-            changed = bool(added_in or removed_in or added_out or removed_out)
-            first_refresh = not self._devices_signature
-
-            if changed or first_refresh:
-                self.cb_in['values'] = inputs
-                self.cb_out['values'] = outputs
-
-                if added_in:
-                    self.hw_log(f"Added inputs: {', '.join(added_in)}")
-                if removed_in:
-                    self.hw_log(f"Removed inputs: {', '.join(removed_in)}")
-                if added_out:
-                    self.hw_log(f"Added outputs: {', '.join(added_out)}")
-                if removed_out:
-                    self.hw_log(f"Removed outputs: {', '.join(removed_out)}")
-
-                if prev_in_sel in inputs:
-                    self.hw_input_dev.set(prev_in_sel)
-                    self.cb_in.set(prev_in_sel)
-                elif inputs:
-                    self.cb_in.current(0)
-                    self.hw_input_dev.set(inputs[0])
-                    if prev_in_sel:
-                        self.hw_log(f"Input '{prev_in_sel}' không còn khả dụng, chuyển sang {inputs[0]}")
-
-                if prev_out_sel in outputs:
-                    self.hw_output_dev.set(prev_out_sel)
-                    self.cb_out.set(prev_out_sel)
-                elif outputs:
-                    self.cb_out.current(0)
-                    self.hw_output_dev.set(outputs[0])
-                    if prev_out_sel:
-                        self.hw_log(f"Output '{prev_out_sel}' không còn khả dụng, chuyển sang {outputs[0]}")
-
-            selected_in = self.hw_input_dev.get() or "(none)"
-            selected_out = self.hw_output_dev.get() or "(none)"
-
-            if changed or first_refresh:
-                self.hw_log(
-                    "Đã làm mới danh sách thiết bị âm thanh. "
-                    f"Inputs: {len(inputs)}, Outputs: {len(outputs)} (query_devices: {in_count}/{out_count}). "
-                    f"Chọn input: {selected_in}; chọn output: {selected_out}."
-                )
-            elif not from_timer:
-                self.hw_log(
-                    "Danh sách thiết bị không đổi. "
-                    f"Inputs: {len(inputs)}, Outputs: {len(outputs)} (query_devices: {in_count}/{out_count}). "
-                    f"Chọn input: {selected_in}; chọn output: {selected_out}."
-                )
-
-            self._last_input_devices = inputs
-            self._last_output_devices = outputs
-            self._devices_signature = devices.get_devices_signature()
-        except Exception as e:
-            self.hw_log(f"Lỗi khi lấy thiết bị: {e}")
+            for cb in (self.cb_in, self.cb_out):
+                if cb.get() == DEVICES_PLACEHOLDER:
+                    cb.set("")
+            if error:
+                self.hw_log(error)
+            elif result is None:
+                if not from_timer:
+                    self._log_devices_summary("Danh sách thiết bị không đổi. ")
+            else:
+                self._apply_devices(*result, from_timer=from_timer)
+        finally:
+            self._refresh_in_flight = False
+            self._devices_ready.set()
+
+    def _apply_devices(self, raw_devices, inputs, outputs, signature, from_timer: bool = False):
+        self._device_counts = (len(inputs), len(outputs))
+
+        prev_in_sel = self.hw_input_dev.get()
+        prev_out_sel = self.hw_output_dev.get()
+
+        input_set, output_set = frozenset(inputs), frozenset(outputs)
+        added_in = [d for d in inputs if d not in self._last_input_set]
+        removed_in = [d for d in self._last_input_devices if d not in input_set]
+        added_out = [d for d in outputs if d not in self._last_output_set]
+        removed_out = [d for d in self._last_output_devices if d not in output_set]
+
+        changed = bool(added_in or removed_in or added_out or removed_out)
+        first_refresh = not self._devices_signature
+
+        if changed or first_refresh:
+            self._device_cache.clear()
+            self.cb_in['values'] = inputs
+            self.cb_out['values'] = outputs
+
+            if added_in:
+                self.hw_log(f"Added inputs: {', '.join(added_in)}")
+            if removed_in:
+                self.hw_log(f"Removed inputs: {', '.join(removed_in)}")
+            if added_out:
+                self.hw_log(f"Added outputs: {', '.join(added_out)}")
+            if removed_out:
+                self.hw_log(f"Removed outputs: {', '.join(removed_out)}")
+
+            if prev_in_sel in inputs:
+                self.hw_input_dev.set(prev_in_sel)
+                self.cb_in.set(prev_in_sel)
+            elif inputs:
+                self.cb_in.current(0)
+                self.hw_input_dev.set(inputs[0])
+                if prev_in_sel:
+                    self.hw_log(f"Input '{prev_in_sel}' không còn khả dụng, chuyển sang {inputs[0]}")
+
+            if prev_out_sel in outputs:
+                self.hw_output_dev.set(prev_out_sel)
+                self.cb_out.set(prev_out_sel)
+            elif outputs:
+                self.cb_out.current(0)
+                self.hw_output_dev.set(outputs[0])
+                if prev_out_sel:
+                    self.hw_log(f"Output '{prev_out_sel}' không còn khả dụng, chuyển sang {outputs[0]}")
+
+        self._last_input_devices = inputs
+        self._last_output_devices = outputs
+        self._last_input_set = input_set
+        self._last_output_set = output_set
+        self._devices_signature = signature
+
+        if changed or first_refresh:
+            self._log_devices_summary("Đã làm mới danh sách thiết bị âm thanh. ")
+        elif not from_timer:
+            self._log_devices_summary("Danh sách thiết bị không đổi. ")
+
+    def _log_devices_summary(self, prefix):
+        in_count, out_count = self._device_counts
+        selected_in = self.hw_input_dev.get() or "(none)"
+        selected_out = self.hw_output_dev.get() or "(none)"
+        self.hw_log(
+            prefix
+            + f"Inputs: {len(self._last_input_devices)}, Outputs: {len(self._last_output_devices)} "
+            f"(query_devices: {in_count}/{out_count}). "
+            f"Chọn input: {selected_in}; chọn output: {selected_out}."
+        )
 
     def _auto_refresh_tick(self):
         if not self.auto_refresh_enabled.get():
             return
         self._refresh_hw_devices(from_timer=True)
-        self._auto_refresh_job = self.master.after(self.auto_refresh_interval_ms, self._auto_refresh_tick)
+        # Schedule against a fixed monotonic deadline so the refresh cost does
+        # not accumulate into the interval.
+        interval = self.auto_refresh_interval_ms / 1000.0
+        now = time.monotonic()
+        self._next_tick_deadline += interval
+        if self._next_tick_deadline <= now:  # fell behind (e.g. system sleep)
+            self._next_tick_deadline = now + interval
+        delay_ms = max(1, int((self._next_tick_deadline - now) * 1000))
+        self._auto_refresh_job = self.master.after(delay_ms, self._auto_refresh_tick)
 
     def _on_auto_refresh_toggle(self):
         if self._auto_refresh_job:
             self.master.after_cancel(self._auto_refresh_job)
             self._auto_refresh_job = None
         if self.auto_refresh_enabled.get():
+            self._next_tick_deadline = time.monotonic() + self.auto_refresh_interval_ms / 1000.0
             self._auto_refresh_job = self.master.after(self.auto_refresh_interval_ms, self._auto_refresh_tick)
 
     # ---------------------------------------------------------
@@ -315,43 +651,46 @@ class AudioAnalysisToolkitApp:
         # -------------------------------------------------
         # SECTION A
         grp_a = ttk.LabelFrame(left, text="A. Đo Compressor (Stepped Sweep)")
-        grp_a.pack(fill="x", padx=6, pady=8)
+        scroll_left.add_row(grp_a, padx=6, pady=8)
 
         ttk.Label(grp_a, text="Quét 36 mức (0.25s/mức) – Tìm Thr, Ratio, Makeup Gain", foreground="blue").pack(anchor="w", padx=6, pady=4)
 
         f = ttk.Frame(grp_a)
         f.pack(fill="x", padx=6, pady=4)
         ttk.Label(f, text="Freq (Hz):").pack(side="left")
-        ttk.Entry(f, textvariable=self.hw_freq, width=8).pack(side="left", padx=6)
+        self.ent_freq = self._value_entry(f, '1000', width=8)
+        self.ent_freq.pack(side="left", padx=6)
 
         ttk.Button(grp_a, text="▶ CHẠY TEST COMPRESSOR (HW)",
                    style="Accent.TButton",
-                   command=lambda: self._start_thread(self.run_hw_compressor, name="compressor_hw")
+                   command=lambda: self._start_thread(self.run_hw_compressor, name="compressor_hw", hw=True)
                    ).pack(fill="x", padx=6, pady=8)
 
         # -------------------------------------------------
         # SECTION B
         grp_b = ttk.LabelFrame(left, text="B. Đo THD (Harmonic Distortion)")
-        grp_b.pack(fill="x", padx=6, pady=8)
+        scroll_left.add_row(grp_b, padx=6, pady=8)
 
         fb = ttk.Frame(grp_b)
         fb.pack(fill="x", padx=6, pady=4)
         ttk.Label(fb, text="Amp (0-1):").pack(side="left")
-        ttk.Entry(fb, textvariable=self.hw_amp, width=8).pack(side="left", padx=6)
+        self.ent_amp = self._value_entry(fb, '0.7', width=8)
+        self.ent_amp.pack(side="left", padx=6)
         ttk.Label(fb, text="Max H:").pack(side="left", padx=(10, 2))
-        ttk.Entry(fb, textvariable=self.thd_max_h, width=4).pack(side="left")
+        self.ent_thd_max_h = self._value_entry(fb, '5', width=4)
+        self.ent_thd_max_h.pack(side="left")
 
         ttk.Button(grp_b, text="▶ CHẠY TEST THD (HW)",
-                   command=lambda: self._start_thread(self.run_hw_thd, name="thd_hw")
+                   command=lambda: self._start_thread(self.run_hw_thd, name="thd_hw", hw=True)
                    ).pack(fill="x", padx=6, pady=8)
 
         # -------------------------------------------------
         # SECTION C
         grp_c = ttk.LabelFrame(left, text="C. Đo Attack / Release (Step Tone)")
-        grp_c.pack(fill="x", padx=6, pady=8)
+        scroll_left.add_row(grp_c, padx=6, pady=8)
 
         ttk.Button(grp_c, text="▶ CHẠY TEST A/R (HW)",
-                   command=lambda: self._start_thread(self.run_hw_attack_release, name="ar_hw")
+                   command=lambda: self._start_thread(self.run_hw_attack_release, name="ar_hw", hw=True)
                    ).pack(fill="x", padx=6, pady=8)
 
         far = ttk.Frame(grp_c)
@@ -362,7 +701,7 @@ class AudioAnalysisToolkitApp:
         # -------------------------------------------------
         # SECTION D
         grp_d = ttk.LabelFrame(left, text="D. Loopback & Phân tích File")
-        grp_d.pack(fill="x", padx=6, pady=8)
+        scroll_left.add_row(grp_d, padx=6, pady=8)
 
         ffile = ttk.Frame(grp_d)
         ffile.pack(fill="x", padx=6, pady=6)
@@ -373,7 +712,7 @@ class AudioAnalysisToolkitApp:
 
         ttk.Button(grp_d, text="1. ▶ CHẠY LOOPBACK & SAVE (All Files)",
                    style="Accent.TButton",
-                   command=lambda: self._start_thread(self.run_loopback_record, name="loopback")
+                   command=lambda: self._start_thread(self.run_loopback_record, name="loopback", hw=True)
                    ).pack(fill="x", padx=6, pady=8)
 
         # Sub-analysis
@@ -389,7 +728,8 @@ class AudioAnalysisToolkitApp:
                    command=lambda: self._start_thread(lambda: self.analyze_loopback('thd'), name="ana_thd")
                    ).pack(side="left", expand=True, fill="x")
         ttk.Label(f_thd, text="Max H:").pack(side="left", padx=6)
-        ttk.Entry(f_thd, textvariable=self.hw_thd_hmax, width=4).pack(side="left")
+        self.ent_thd_hmax = self._value_entry(f_thd, '5', width=4)
+        self.ent_thd_hmax.pack(side="left")
 
         f_ar2 = ttk.Frame(ana)
         f_ar2.pack(fill="x", padx=6, pady=4)
@@ -401,7 +741,7 @@ class AudioAnalysisToolkitApp:
         # -------------------------------------------------
         # SECTION E
         grp_e = ttk.LabelFrame(left, text="E. Phân tích 2 File Offline")
-        grp_e.pack(fill="x", padx=6, pady=8)
+        scroll_left.add_row(grp_e, padx=6, pady=8)
 
         fe = ttk.Frame(grp_e)
         fe.pack(fill="x", padx=6, pady=6)
@@ -431,7 +771,7 @@ class AudioAnalysisToolkitApp:
         log_frame = ttk.Frame(right)
         log_frame.pack(fill="both", expand=True, padx=6, pady=6)
 
-        self.log_text = tk.Text(log_frame, font=LOG_FONT, bg="#f4f4f4", wrap="none")
+        self.log_text = tk.Text(log_frame, font=self.log_font, bg="#f4f4f4", wrap="none")
         self.log_text.pack(side="left", fill="both", expand=True)
 
         scroll_log = ttk.Scrollbar(log_frame, command=self.log_text.yview)
@@ -444,39 +784,84 @@ class AudioAnalysisToolkitApp:
     # ---------------------------------------------------------
     # HARDWARE TASKS
     # ---------------------------------------------------------
-    def _device_indices(self):
-        return devices.parse_device(self.hw_input_dev.get()), devices.parse_device(self.hw_output_dev.get())
+    def _resolve_devices(self):
+        """Return ``(in_dev, out_dev, fs)`` for the current selection.
+
+        Cached per selection and device-list signature, so repeat measurements
+        skip the PortAudio samplerate query.
+        """
+        from audio import devices
+
+        key = (self.hw_input_dev.get(), self.hw_output_dev.get(), self._devices_signature)
+        resolved = self._device_cache.get(key)
+        if resolved is None:
+            in_dev, out_dev = devices.parse_device(key[0]), devices.parse_device(key[1])
+            resolved = (in_dev, out_dev, devices.default_samplerate(out_dev or None))
+            self._device_cache[key] = resolved
+        return resolved
 
     def _prepare_signal(self, sig: np.ndarray) -> np.ndarray:
-        sig = sig.astype(np.float32)
+        import numpy as np
+
+        # The generators already hand over float32, so this is normally a no-op
+        sig = np.asarray(sig, dtype=np.float32)
+        if not sig.flags.writeable:
+            sig = sig.copy()
         fade = min(256, len(sig) // 10)
         if fade > 0:
-            window = np.linspace(0, 1, fade)
-            sig[:fade] *= window
-            sig[-fade:] *= window[::-1]
+            window = _fade_window(fade)
+            if sig.ndim > 1:  # stereo (N, 2) tones: ramp every channel
+                window = window[:, None]
+            np.multiply(sig[:fade], window, out=sig[:fade])
+            np.multiply(sig[-fade:], window[::-1], out=sig[-fade:])
         return sig
 
+    def _stimulus(self, key, factory):
+        """Faded, read-only stimulus for ``key``; built once per settings.
+
+        ``factory`` returns a dict with at least ``"signal"`` (like
+        ``generate_compressor_tone``); other entries are cached alongside.
+        """
+        cached = self._stimulus_cache.get(key)
+        if cached is None:
+            cached = dict(factory())
+            cached["signal"] = self._prepare_signal(cached["signal"])
+            cached["signal"].setflags(write=False)
+            self._stimulus_cache[key] = cached
+            while len(self._stimulus_cache) > STIMULUS_CACHE_SIZE:
+                self._stimulus_cache.popitem(last=False)
+        else:
+            self._stimulus_cache.move_to_end(key)
+        return cached
+
     def _log_recording_stats(self, data: np.ndarray, label: str = "Rx"):
+        import numpy as np
+        from analysis import live_measurements
+
         try:
-            flat = np.asarray(data, dtype=np.float32).flatten()
+            # ravel() is a view for the usual contiguous mono capture
+            flat = np.ascontiguousarray(data, dtype=np.float32).ravel()
             if flat.size == 0:
                 self.hw_log(f"{label}: (no samples)")
                 return
-            rms = float(np.sqrt(np.mean(np.square(flat))))
-            clip = int(np.sum(np.abs(flat) >= 0.999))
-            self.hw_log(f"{label}: min {flat.min():.4f} | max {flat.max():.4f} | rms {rms:.4f} | clips {clip}")
+            st = live_measurements.recording_stats(flat)
+            self.hw_log(f"{label}: min {st['min']:.4f} | max {st['max']:.4f} | rms {st['rms']:.4f} | clips {st['clips']}")
         except Exception as exc:  # pragma: no cover - logging best-effort
             self.hw_log(f"{label}: lỗi khi log thống kê ({exc})")
 
     def run_hw_thd(self):
         if not self._require_sounddevice():
             return
-        freq = self._parse_float(self.hw_freq, 1000.0)
-        amp = self._parse_float(self.hw_amp, 0.7)
-        hmax = self._parse_int(self.thd_max_h, 5)
-        in_dev, out_dev = self._device_indices()
-        fs = devices.default_samplerate(out_dev or None)
-        tone = self._prepare_signal(live_measurements.generate_thd_tone(freq, amp, fs))
+        from analysis import live_measurements
+        from audio import playrec
+
+        freq = self._parse_float(self.ent_freq, 1000.0)
+        amp = self._parse_float(self.ent_amp, 0.7)
+        hmax = self._parse_int(self.ent_thd_max_h, 5)
+        in_dev, out_dev, fs = self._resolve_devices()
+        tone = self._stimulus(
+            ("thd", freq, amp, fs), lambda: {"signal": live_measurements.generate_thd_tone(freq, amp, fs)}
+        )["signal"]
         self.logger.banner(f"THD HW @ {freq} Hz, amp {amp}")
         recorded = playrec.play_and_record(
             tone, fs, in_dev, out_dev, self.stop_event, log=self.hw_log, input_channels=1
@@ -484,6 +869,7 @@ class AudioAnalysisToolkitApp:
         if recorded is None or len(recorded) == 0:
             self.hw_log("Không ghi được dữ liệu.")
             return
+        recorded.setflags(write=False)  # private capture; save_artifacts_async skips its copy
         self._log_recording_stats(recorded, "THD Rx")
         res = live_measurements.analyze_thd_capture(recorded, fs, freq, hmax)
         thd_percent = res.get("thd_percent_manual", 0.0)
@@ -492,25 +878,30 @@ class AudioAnalysisToolkitApp:
         self.hw_log(f"THD ≈ {thd_percent:.4f}% ({thd_db:.2f} dB)")
         for h, v in harmonics.items():
             self.hw_log(f"H{h}: {v:.2f} dBc")
-        csv_path = live_measurements.append_csv_row(
+        csv_path = live_measurements.append_csv_row_async(
             (time.strftime("%Y-%m-%d %H:%M:%S"), "THD", f"{thd_percent:.4f}%", f"{thd_db:.2f} dB"),
             BASE_DIR,
+            log=self.hw_log,
         )
         self.hw_log(f"💾 Đã lưu kết quả vào '{csv_path}'.")
-        artifacts = live_measurements.save_artifacts("thd", tone, recorded, fs, BASE_DIR)
+        artifacts = live_measurements.save_artifacts_async("thd", tone, recorded, fs, BASE_DIR, log=self.hw_log)
         self.hw_log(f"Đã lưu TX/RX: {artifacts['tx']} | {artifacts['rx']}")
         sig_for_plot = res.get("normalized_signal", recorded)
-        self._schedule_plot(self.plot_manager.open_thd_snapshot, sig_for_plot, fs, res, freq, hmax)
+        self._schedule_plot("open_thd_snapshot", sig_for_plot, fs, res, freq, hmax)
 
     def run_hw_compressor(self):
         if not self._require_sounddevice():
             return
-        freq = self._parse_float(self.hw_freq, 1000.0)
-        amp_max = self._parse_float(self.hw_amp, 1.36)
-        in_dev, out_dev = self._device_indices()
-        fs = devices.default_samplerate(out_dev or None)
-        tx_meta = live_measurements.generate_compressor_tone(freq, fs, amp_max)
-        tone = self._prepare_signal(tx_meta['signal'])
+        from analysis import live_measurements
+        from audio import playrec
+
+        freq = self._parse_float(self.ent_freq, 1000.0)
+        amp_max = self._parse_float(self.ent_amp, 1.36)
+        in_dev, out_dev, fs = self._resolve_devices()
+        tx_meta = self._stimulus(
+            ("compressor", freq, amp_max, fs), lambda: live_measurements.generate_compressor_tone(freq, fs, amp_max)
+        )
+        tone = tx_meta['signal']
         self.logger.banner("Đo compressor (stepped sweep)")
         recorded = playrec.play_and_record(
             tone, fs, in_dev, out_dev, self.stop_event, log=self.hw_log, input_channels=1
@@ -518,6 +909,7 @@ class AudioAnalysisToolkitApp:
         if recorded is None or len(recorded) == 0:
             self.hw_log("Không ghi được dữ liệu compressor.")
             return
+        recorded.setflags(write=False)
         self._log_recording_stats(recorded, "Compressor Rx")
         curve = live_measurements.analyze_compressor_capture(recorded, tx_meta['meta'], fs)
         if curve['no_compression']:
@@ -530,29 +922,34 @@ class AudioAnalysisToolkitApp:
             "No compression" if curve['no_compression'] else f"Thr {curve['thr_db']:.2f} dBFS",
             f"Ratio {curve['ratio']:.2f}:1" if not curve['no_compression'] else f"Gain {curve['gain_offset_db']:+.2f} dB",
         )
-        csv_path = live_measurements.append_csv_row(csv_row, BASE_DIR)
+        csv_path = live_measurements.append_csv_row_async(csv_row, BASE_DIR, log=self.hw_log)
         self.hw_log(f"💾 Đã lưu kết quả vào '{csv_path}'.")
-        artifacts = live_measurements.save_artifacts("compressor", tone, recorded, fs, BASE_DIR)
+        artifacts = live_measurements.save_artifacts_async("compressor", tone, recorded, fs, BASE_DIR, log=self.hw_log)
         self.hw_log(f"Đã lưu TX/RX: {artifacts['tx']} | {artifacts['rx']}")
-        self._schedule_plot(self.plot_manager.open_compressor_snapshot, [("Captured", curve)])
+        self._schedule_plot("open_compressor_snapshot", [("Captured", curve)])
 
     def run_hw_attack_release(self):
         if not self._require_sounddevice():
             return
-        freq = self._parse_float(self.hw_freq, 1000.0)
-        amp = self._parse_float(self.hw_amp, 0.7)
+        from analysis import attack_release
+        from audio import playrec
+
+        freq = self._parse_float(self.ent_freq, 1000.0)
+        amp = self._parse_float(self.ent_amp, 0.7)
         rms_win = self._parse_float(self.hw_ar_rms_win, 5)
-        in_dev, out_dev = self._device_indices()
-        fs = devices.default_samplerate(out_dev or None)
-        tone = self._prepare_signal(attack_release.generate_step_tone(freq, fs, amp=amp))
+        in_dev, out_dev, fs = self._resolve_devices()
+        tone = self._stimulus(
+            ("attack_release", freq, amp, fs), lambda: {"signal": attack_release.generate_step_tone(freq, fs, amp=amp)}
+        )["signal"]
         self.logger.banner("Đo Attack/Release")
         recorded = playrec.play_and_record(tone, fs, in_dev, out_dev, self.stop_event, log=self.hw_log)
         if recorded is None:
             self.hw_log("Không ghi được dữ liệu A/R.")
             return
+        recorded.setflags(write=False)
         times = attack_release.attack_release_times(recorded, fs, rms_win)
         self.hw_log(f"Attack ≈ {times['attack_ms']:.1f} ms | Release ≈ {times['release_ms']:.1f} ms")
-        self._schedule_plot(self.plot_manager.open_ar_snapshot, recorded, fs, rms_win, times)
+        self._schedule_plot("open_ar_snapshot", recorded, fs, rms_win, times)
 
     # ---------------------------------------------------------
     # LOOPBACK & FILE OPERATIONS
@@ -560,9 +957,12 @@ class AudioAnalysisToolkitApp:
     def run_loopback_record(self):
         if not self._require_sounddevice():
             return
-        in_dev, out_dev = self._device_indices()
+        import numpy as np
+        from audio import playrec, wav_io
+
+        in_dev, out_dev, _ = self._resolve_devices()
         src = self.hw_loop_file.get()
-        if not src or not os.path.isfile(src):
+        if not self._is_file(src):
             messagebox.showwarning("Chọn file", "Chọn file WAV input.")
             return
         fs, data = wav_io.read_wav(src)
@@ -586,18 +986,53 @@ class AudioAnalysisToolkitApp:
     # ---------------------------------------------------------
     # ANALYSIS HELPERS
     # ---------------------------------------------------------
-    def _analyze_single_file(self, mode: str, path: str):
+    def _read_wav_cached(self, path: str):
+        """``wav_io.read_wav`` plus a stat stamp; reuses the decode while unchanged.
+
+        Returns ``(fs, data, stamp)`` with ``data`` read-only, or
+        ``(None, None, None)`` when the file cannot be read.
+        """
+        import numpy as np
+        from audio import wav_io
+
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None, None, None
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._wav_cache_lock:
+            cached = self._wav_cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1], cached[2], stamp
         fs, data = wav_io.read_wav(path)
+        with self._wav_cache_lock:
+            if fs is None:
+                self._wav_cache.pop(path, None)
+                return None, None, None
+            if isinstance(data, np.memmap):
+                # a cached mapping would keep the file open (no overwrite or
+                # delete on Windows while it sits in the cache)
+                data = np.array(data)
+            data.setflags(write=False)
+            if path not in self._wav_cache and len(self._wav_cache) >= WAV_CACHE_SIZE:
+                self._wav_cache.pop(next(iter(self._wav_cache)))
+            self._wav_cache[path] = (stamp, fs, data)
+        return fs, data, stamp
+
+    def _analyze_single_file(self, mode: str, path: str):
+        from analysis import attack_release, compressor, thd
+
+        fs, data, _ = self._read_wav_cached(path)
         if fs is None:
             self.hw_log("Không đọc được file.")
             return
-        freq = self._parse_float(self.hw_freq, 1000.0)
-        hmax = self._parse_int(self.hw_thd_hmax, 5)
+        freq = self._parse_float(self.ent_freq, 1000.0)
+        hmax = self._parse_int(self.ent_thd_hmax, 5)
         rms_win = self._parse_float(self.hw_ar_rms_win, 5)
         if mode == 'thd':
             res = thd.compute_thd(data, fs, freq, hmax)
             self.hw_log(f"[Single] THD {os.path.basename(path)}: {res['thd_percent']:.4f}% ({res['thd_db']:.2f} dB)")
-            self._schedule_plot(self.plot_manager.open_thd_snapshot, data, fs, res, freq, hmax)
+            self._schedule_plot("open_thd_snapshot", data, fs, res, freq, hmax)
         elif mode == 'compressor':
             meta = compressor.build_stepped_tone(freq, fs)
             res = compressor.compression_curve(data, meta['meta'], fs, freq)
@@ -605,11 +1040,11 @@ class AudioAnalysisToolkitApp:
                 self.hw_log("[Single] Không phát hiện nén.")
             else:
                 self.hw_log(f"[Single] Thr {res['thr_db']:.2f} dBFS | Ratio {res['ratio']:.2f}:1 | Gain {res['gain_offset_db']:+.2f} dB")
-            self._schedule_plot(self.plot_manager.open_compressor_snapshot, [("Captured", res)])
+            self._schedule_plot("open_compressor_snapshot", [("Captured", res)])
         elif mode == 'ar':
             times = attack_release.attack_release_times(data, fs, rms_win)
             self.hw_log(f"[Single] Attack {times['attack_ms']:.1f} ms | Release {times['release_ms']:.1f} ms")
-            self._schedule_plot(self.plot_manager.open_ar_snapshot, data, fs, rms_win, times)
+            self._schedule_plot("open_ar_snapshot", data, fs, rms_win, times)
 
     def _log_residual_metrics(self, metrics, latency_ms, gain_error_db):
         self.hw_log(f"Latency: {latency_ms:.2f} ms | Gain error: {gain_error_db:+.2f} dB")
@@ -620,11 +1055,14 @@ class AudioAnalysisToolkitApp:
         self.hw_log(f"Hum peaks: {hums}")
 
     def _analyze_pair(self, mode: str, input_path: str, recv_path: str):
-        freq = self._parse_float(self.hw_freq, 1000.0)
-        hmax = self._parse_int(self.hw_thd_hmax, 5)
+        import numpy as np
+        from analysis import attack_release, compare, compressor, thd
+
+        freq = self._parse_float(self.ent_freq, 1000.0)
+        hmax = self._parse_int(self.ent_thd_hmax, 5)
         rms_win = self._parse_float(self.hw_ar_rms_win, 5)
-        fs_in, sig_in = wav_io.read_wav(input_path)
-        fs_out, sig_out = wav_io.read_wav(recv_path)
+        fs_in, sig_in, stamp_in = self._read_wav_cached(input_path)
+        fs_out, sig_out, stamp_out = self._read_wav_cached(recv_path)
         if fs_in is None or fs_out is None:
             self.hw_log("Không đọc được file input/output.")
             return
@@ -634,7 +1072,13 @@ class AudioAnalysisToolkitApp:
         sig_in = np.asarray(sig_in, dtype=np.float32)
         sig_out = np.asarray(sig_out, dtype=np.float32)
         max_lag = int(fs_in * 5)  # cap search to ~5s to avoid runaway correlation
-        a_in, a_out, lag = compare.align_signals(sig_in, sig_out, max_lag_samples=max_lag)
+        # Back-to-back analyses of the same pair reuse the correlation
+        align_key = (input_path, stamp_in, recv_path, stamp_out, max_lag)
+        if self._align_cache is not None and self._align_cache[0] == align_key:
+            a_in, a_out, lag = self._align_cache[1]
+        else:
+            a_in, a_out, lag = compare.align_signals(sig_in, sig_out, max_lag_samples=max_lag)
+            self._align_cache = (align_key, (a_in, a_out, lag))
         a_out, gain_err = compare.gain_match(a_in, a_out)
         latency_ms = lag / fs_in * 1000.0
         metrics = compare.residual_metrics(a_in, a_out, fs_in, freq, hmax)
@@ -642,7 +1086,7 @@ class AudioAnalysisToolkitApp:
         if mode == 'thd':
             self.hw_log(f"THD input: {metrics['thd_ref_db']:.2f} dB | received: {metrics['thd_tgt_db']:.2f} dB")
             res_out = thd.compute_thd(a_out, fs_in, freq, hmax)
-            self._schedule_plot(self.plot_manager.open_thd_snapshot, a_out, fs_in, res_out, freq, hmax)
+            self._schedule_plot("open_thd_snapshot", a_out, fs_in, res_out, freq, hmax)
         elif mode == 'compressor':
             meta = compressor.build_stepped_tone(freq, fs_in)
             base_curve = compressor.compression_curve(a_in, meta['meta'], fs_in, freq)
@@ -650,20 +1094,31 @@ class AudioAnalysisToolkitApp:
             self.hw_log(f"Input Thr {base_curve['thr_db']:.2f} | Ratio {base_curve['ratio']:.2f}")
             self.hw_log(f"Received Thr {out_curve['thr_db']:.2f} | Ratio {out_curve['ratio']:.2f}")
             self.hw_log(f"ΔThr {out_curve['thr_db'] - base_curve['thr_db']:+.2f} dB | ΔRatio {out_curve['ratio'] - base_curve['ratio']:+.2f}")
-            self._schedule_plot(self.plot_manager.open_compressor_snapshot, [("Input", base_curve), ("Output", out_curve)])
+            self._schedule_plot("open_compressor_snapshot", [("Input", base_curve), ("Output", out_curve)])
         elif mode == 'ar':
             cmp_ar = attack_release.compare_attack_release(a_in, a_out, fs_in, rms_win)
             self.hw_log(f"Attack in/out: {cmp_ar['input']['attack_ms']:.1f} / {cmp_ar['output']['attack_ms']:.1f} ms | Δ {cmp_ar['delta_attack']:+.1f} ms")
             self.hw_log(f"Release in/out: {cmp_ar['input']['release_ms']:.1f} / {cmp_ar['output']['release_ms']:.1f} ms | Δ {cmp_ar['delta_release']:+.1f} ms")
-            self._schedule_plot(self.plot_manager.open_ar_snapshot, a_out, fs_in, rms_win, cmp_ar['output'])
+            self._schedule_plot("open_ar_snapshot", a_out, fs_in, rms_win, cmp_ar['output'])
+
+    @staticmethod
+    def _is_file(path) -> bool:
+        """One ``stat`` per path; False for empty, missing or non-regular paths."""
+        if not path:
+            return False
+        try:
+            return stat.S_ISREG(os.stat(path).st_mode)
+        except (OSError, ValueError):
+            return False
 
     def analyze_loopback(self, mode: str):
         inp = self.state.get('input_file') or self.hw_loop_file.get()
         rec = self.state.get('received_file')
-        if inp and rec and os.path.isfile(inp) and os.path.isfile(rec):
+        inp_ok = self._is_file(inp)
+        if inp_ok and self._is_file(rec):
             self.logger.banner("COMPARE MODE (Loopback)")
             self._analyze_pair(mode, inp, rec)
-        elif inp and os.path.isfile(inp):
+        elif inp_ok:
             self.logger.banner("SINGLE FILE MODE (Loopback)")
             self._analyze_single_file(mode, inp)
         else:
@@ -672,13 +1127,14 @@ class AudioAnalysisToolkitApp:
     def analyze_offline(self, mode: str):
         inp = self.offline_in.get()
         out = self.offline_out.get()
-        if inp and out and os.path.isfile(inp) and os.path.isfile(out):
+        inp_ok, out_ok = self._is_file(inp), self._is_file(out)
+        if inp_ok and out_ok:
             self.logger.banner("COMPARE MODE (Offline)")
             self._analyze_pair(mode, inp, out)
-        elif inp and os.path.isfile(inp):
+        elif inp_ok:
             self.logger.banner("SINGLE FILE MODE (Offline)")
             self._analyze_single_file(mode, inp)
-        elif out and os.path.isfile(out):
+        elif out_ok:
             self.logger.banner("SINGLE FILE MODE (Offline out)")
             self._analyze_single_file(mode, out)
         else:
@@ -2,17 +2,64 @@ import os
 import numpy as np
 from typing import Dict, Any, Optional
 
+from .jit import NUMBA_AVAILABLE, njit
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _step_tone_kernel(n: int, amp: float, omega: float) -> np.ndarray:
+    out = np.empty(n, dtype=np.float32)
+    attack_idx = n // 4
+    release_idx = 3 * n // 4
+    for i in range(n):
+        gain = 1.0 if attack_idx <= i < release_idx else 0.3
+        out[i] = amp * np.sin(omega * i) * gain
+    return out
+
+
+CROSSING_BLOCK = 4096  # samples per mask in the NumPy first-crossing fallback
+
+
+# No fastmath: it would let LLVM assume no NaNs in the comparisons, and the
+# loop has no arithmetic to speed up anyway.
+@njit(cache=True, nogil=True)
+def _first_crossing_kernel(x: np.ndarray, level: float, up: bool) -> int:
+    for i in range(x.shape[0]):
+        if (x[i] >= level) if up else (x[i] <= level):
+            return i
+    return -1
+
+
+def first_crossing(x: np.ndarray, level: float, direction: str = 'up') -> Optional[int]:
+    """Index of the first sample at/above (``'up'``) or at/below ``level``, or None.
+
+    With Numba the scan stops at the crossing without building a mask.
+    """
+    if NUMBA_AVAILABLE:
+        idx = _first_crossing_kernel(np.asarray(x), float(level), direction == 'up')
+        return idx if idx >= 0 else None
+    # Block-wise so the mask stays cache-sized and the scan still stops early
+    for start in range(0, len(x), CROSSING_BLOCK):
+        block = x[start : start + CROSSING_BLOCK]
+        mask = block >= level if direction == 'up' else block <= level
+        # argmax stops at the first True; it returns 0 when there is none
+        idx = int(np.argmax(mask))
+        if mask[idx]:
+            return start + idx
+    return None
+
 
 def generate_step_tone(freq: float, fs: int, amp: float = 0.7, duration: float = 2.0) -> np.ndarray:
-    t = np.linspace(0, duration, int(fs * duration), endpoint=False)
-    tone = amp * np.sin(2 * np.pi * freq * t)
+    n = int(fs * duration)
+    if NUMBA_AVAILABLE and n > 0:
+        # One pass straight into the float32 output, no t/env temporaries
+        return _step_tone_kernel(n, float(amp), 2 * np.pi * freq * duration / n)
+    tone = np.arange(n) * (2 * np.pi * freq * duration / max(n, 1))
+    np.sin(tone, out=tone)
+    tone *= amp
     # amplitude steps: low -> high -> low to expose attack and release
-    env = np.ones_like(tone) * 0.3
-    attack_idx = len(env) // 4
-    release_idx = 3 * len(env) // 4
-    env[attack_idx:release_idx] = 1.0
-    env[release_idx:] = 0.3
-    return (tone * env).astype(np.float32)
+    tone[: n // 4] *= 0.3
+    tone[3 * n // 4 :] *= 0.3
+    return tone.astype(np.float32)
 
 
 def envelope_rms(sig: np.ndarray, fs: int, win_ms: float) -> np.ndarray:
@@ -60,17 +107,10 @@ def attack_release_times(sig: np.ndarray, fs: int, win_ms: float) -> Dict[str, f
     search_rise = env[q1 - n // 10 : q3]
     search_fall = env[q3 - n // 10 :]
 
-    def _crossing(x: np.ndarray, level: float, direction: str = 'up') -> Optional[int]:
-        if direction == 'up':
-            idxs = np.nonzero(x >= level)[0]
-        else:
-            idxs = np.nonzero(x <= level)[0]
-        return int(idxs[0]) if idxs.size else None
-
-    atk_start_rel = _crossing(search_rise, atk_start_lvl, 'up')
-    atk_end_rel = _crossing(search_rise, atk_end_lvl, 'up')
-    rel_start_rel = _crossing(search_fall, rel_start_lvl, 'down')
-    rel_end_rel = _crossing(search_fall, rel_end_lvl, 'down')
+    atk_start_rel = first_crossing(search_rise, atk_start_lvl, 'up')
+    atk_end_rel = first_crossing(search_rise, atk_end_lvl, 'up')
+    rel_start_rel = first_crossing(search_fall, rel_start_lvl, 'down')
+    rel_end_rel = first_crossing(search_fall, rel_end_lvl, 'down')
 
     attack_idx = atk_end_idx = release_idx = None
     if atk_start_rel is not None and atk_end_rel is not None:
@@ -2,6 +2,8 @@ import numpy as np
 from typing import Dict, Any, Tuple, Optional
 from . import thd
 
+_DIRECT_MAX_LAGS = 256  # up to this many lags, BLAS dot products beat three FFTs
+
 
 def _to_mono(x: np.ndarray) -> np.ndarray:
     arr = np.asarray(x, dtype=np.float32)
@@ -12,8 +14,54 @@ def _smooth_abs(x: np.ndarray, win: int = 256) -> np.ndarray:
     mag = np.abs(x)
     if len(mag) < win:
         return mag
-    kernel = np.ones(win) / float(win)
-    return np.convolve(mag, kernel, mode='same')
+    # Running box sum via cumsum, equal to np.convolve(mag, ones(win) / win,
+    # mode='same'): output i averages mag[i - win // 2 : i + (win - 1) // 2 + 1].
+    # One extra leading zero so cumsum[k] is the sum of the first k samples.
+    # The pad stays float32; only the running sum needs float64 precision.
+    padded = np.pad(mag, (win // 2 + 1, (win - 1) // 2))
+    cumsum = np.cumsum(padded, dtype=np.float64)
+    return (cumsum[win:] - cumsum[:-win]) / float(win)
+
+
+def _next_fast_len(n: int) -> int:
+    """Smallest ``2**a * 3**b * 5**c >= n``; such sizes keep the FFT fast."""
+    if n <= 1:
+        return 1
+    best = 1 << (n - 1).bit_length()
+    p5 = 1
+    while p5 < best:
+        p35 = p5
+        while p35 < best:
+            m = p35
+            while m < n:
+                m *= 2
+            best = min(best, m)
+            p35 *= 3
+        p5 *= 5
+    return best
+
+
+def _xcorr_full(target: np.ndarray, ref: np.ndarray) -> np.ndarray:
+    """``np.correlate(target, ref, mode='full')`` evaluated through the FFT."""
+    n_t, n_r = len(target), len(ref)
+    nfft = _next_fast_len(n_t + n_r - 1)
+    spec = np.fft.rfft(target, nfft) * np.conj(np.fft.rfft(ref, nfft))
+    circ = np.fft.irfft(spec, nfft)
+    # circular lags -(n_r - 1)..-1 wrap to the end of the buffer
+    return np.concatenate((circ[nfft - (n_r - 1):], circ[:n_t]))
+
+
+def _xcorr_lags(target: np.ndarray, ref: np.ndarray, lo: int, hi: int) -> np.ndarray:
+    """Entries ``lo..hi`` (lags) of the full correlation, one dot product each."""
+    out = np.empty(hi - lo + 1)
+    for i, lag in enumerate(range(lo, hi + 1)):
+        if lag >= 0:
+            m = min(len(ref), len(target) - lag)
+            out[i] = np.dot(target[lag : lag + m], ref[:m])
+        else:
+            m = min(len(target), len(ref) + lag)
+            out[i] = np.dot(target[:m], ref[-lag : -lag + m])
+    return out
 
 
 def align_signals(
@@ -22,26 +70,36 @@ def align_signals(
     max_lag_samples: Optional[int] = None,
     prefer_onset: bool = True,
 ) -> Tuple[np.ndarray, np.ndarray, int]:
-    """Align signals using envelope cross-correlation with optional lag bounds."""
+    """Align signals using envelope cross-correlation with optional lag bounds.
+
+    The aligned outputs are views into ``ref``/``target`` whenever those are
+    already C-contiguous float32 (e.g. WAV captures); other inputs are
+    converted once here so the FFT stages downstream never copy again.
+    """
 
     ref_raw = _to_mono(ref)
     tgt_raw = _to_mono(target)
     ref_mono = _smooth_abs(ref_raw)
     tgt_mono = _smooth_abs(tgt_raw)
 
-    corr = np.correlate(tgt_mono, ref_mono, mode='full')
-    center = len(ref_mono) - 1
-    lag_corr = int(np.argmax(corr) - center)
-    if max_lag_samples is not None:
-        window = slice(max(0, center - max_lag_samples), min(len(corr), center + max_lag_samples + 1))
-        subcorr = corr[window]
-        lag_corr = int(np.argmax(subcorr) + window.start - center)
+    if max_lag_samples is None:
+        corr = _xcorr_full(tgt_mono, ref_mono)
+        lag_corr = int(np.argmax(corr) - (len(ref_mono) - 1))
+    else:
+        lo = -min(max_lag_samples, len(ref_mono) - 1)
+        hi = min(max_lag_samples, len(tgt_mono) - 1)
+        if hi - lo + 1 <= _DIRECT_MAX_LAGS:
+            subcorr = _xcorr_lags(tgt_mono, ref_mono, lo, hi)
+        else:
+            center = len(ref_mono) - 1
+            subcorr = _xcorr_full(tgt_mono, ref_mono)[center + lo : center + hi + 1]
+        lag_corr = int(np.argmax(subcorr) + lo)
 
     def onset_idx(raw: np.ndarray) -> int:
         abs_raw = np.abs(raw)
         thresh = 0.1 * float(np.max(abs_raw) + 1e-12)
-        idxs = np.nonzero(abs_raw > thresh)[0]
-        return int(idxs[0]) if idxs.size else 0
+        # first sample above threshold; argmax gives 0 when none is, as before
+        return int(np.argmax(abs_raw > thresh))
 
     lag_onset = onset_idx(tgt_raw) - onset_idx(ref_raw)
     lag = lag_onset if prefer_onset and lag_onset != 0 else lag_corr
@@ -54,7 +112,11 @@ def align_signals(
         aligned_tgt = target[: len(aligned_ref)]
 
     min_len = min(len(aligned_ref), len(aligned_tgt))
-    return aligned_ref[:min_len], aligned_tgt[:min_len], lag
+    return (
+        np.ascontiguousarray(aligned_ref[:min_len], dtype=np.float32),
+        np.ascontiguousarray(aligned_tgt[:min_len], dtype=np.float32),
+        lag,
+    )
 
 
 def gain_match(
@@ -72,31 +134,28 @@ def gain_match(
         s_idx, e_idx = 0, n
     ref_slice = ref_mono[s_idx:e_idx]
     tgt_slice = tgt_mono[s_idx:e_idx]
-    rms_ref = np.sqrt(np.mean(ref_slice ** 2) + 1e-12)
-    rms_tgt = np.sqrt(np.mean(tgt_slice ** 2) + 1e-12)
-    gain = rms_ref / max(rms_tgt, 1e-12)
+    rms_ref = np.sqrt(_mean_square(ref_slice) + 1e-12)
+    rms_tgt = np.sqrt(_mean_square(tgt_slice) + 1e-12)
+    # Python-float gain: scaling keeps the capture's dtype (float32 stays float32)
+    gain = float(rms_ref / max(rms_tgt, 1e-12))
     gain_db = 20 * np.log10(1.0 / gain + 1e-12)
     return target * gain, gain_db
 
 
-def _freq_response_delta(ref: np.ndarray, tgt: np.ndarray, fs: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-    window = np.hanning(len(ref))
-    spec_ref = np.fft.rfft(ref * window)
-    spec_tgt = np.fft.rfft(tgt * window)
-    mag_ref = 20 * np.log10(np.abs(spec_ref) + 1e-12)
-    mag_tgt = 20 * np.log10(np.abs(spec_tgt) + 1e-12)
-    freqs = np.fft.rfftfreq(len(ref), 1 / fs)
-    return freqs, mag_ref, mag_tgt
+def _mean_square(x: np.ndarray) -> float:
+    """mean(x ** 2) without the squared temporary (float64 accumulation)."""
+    flat = x if x.ndim == 1 else np.ravel(x)  # strided 1-D views need no copy
+    return float(np.einsum('i,i->', flat, flat, dtype=np.float64) / max(flat.size, 1))
 
 
 def _detect_hum_peaks(freqs: np.ndarray, mag: np.ndarray) -> list:
-    hum_bins = []
-    for base in (50, 60):
-        for mul in range(1, 6):
-            f = base * mul
-            idx = np.argmin(np.abs(freqs - f))
-            hum_bins.append({"freq": float(f), "level_db": float(mag[idx])})
-    return hum_bins
+    hum_freqs = [base * mul for base in (50, 60) for mul in range(1, 6)]
+    if len(freqs) < 2:
+        return [{"freq": float(f), "level_db": float(mag[0])} for f in hum_freqs]
+    # rfftfreq bins are evenly spaced, so the nearest bin is plain arithmetic
+    df = freqs[1] - freqs[0]
+    idxs = np.clip(np.ceil(np.asarray(hum_freqs) / df - 0.5), 0, len(freqs) - 1).astype(np.int64)
+    return [{"freq": float(f), "level_db": float(mag[i])} for f, i in zip(hum_freqs, idxs)]
 
 
 def residual_metrics(
@@ -118,10 +177,10 @@ def residual_metrics(
 
     ref_core = ref[s_idx:e_idx]
     tgt_core = tgt[s_idx:e_idx]
-    residual = tgt_core - ref_core
+    residual = np.subtract(tgt_core, ref_core)
 
-    res_rms = np.sqrt(np.mean(residual ** 2) + 1e-12)
-    ref_rms = np.sqrt(np.mean(ref_core ** 2) + 1e-12)
+    res_rms = np.sqrt(_mean_square(residual) + 1e-12)
+    ref_rms = np.sqrt(_mean_square(ref_core) + 1e-12)
     snr = 20 * np.log10(ref_rms / res_rms + 1e-12)
     noise_floor = 20 * np.log10(res_rms + 1e-12)
 
@@ -129,7 +188,9 @@ def residual_metrics(
     thd_tgt = thd.compute_thd(tgt_core, fs, freq, hmax)
     thd_delta = thd_tgt["thd_db"] - thd_ref["thd_db"]
 
-    freqs, mag_ref, mag_tgt = _freq_response_delta(ref_core, tgt_core, fs)
+    # compute_thd already returns the Hann-windowed dB spectrum; reuse it for
+    # the frequency-response delta instead of transforming both signals again
+    freqs, mag_ref, mag_tgt = thd_ref["freqs"], thd_ref["spectrum"], thd_tgt["spectrum"]
     fr_dev = mag_tgt - mag_ref
     band = (freqs >= 20) & (freqs <= 20000)
     fr_band = fr_dev[band]
@@ -157,3 +218,22 @@ def residual_metrics(
     return metrics
 
 
+def compare_pair(
+    ref: np.ndarray,
+    tgt: np.ndarray,
+    fs: int,
+    freq: float,
+    hmax: int = 5,
+    max_lag_samples: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Align, gain-match and score one reference/capture pair.
+
+    Pure array-in, scalars-out (no I/O or logging), so batch runners can call
+    it per pair from worker threads.
+    """
+
+    aligned_ref, aligned_tgt, lag = align_signals(ref, tgt, max_lag_samples=max_lag_samples)
+    gain_matched, gain_error_db = gain_match(aligned_ref, aligned_tgt)
+    metrics = residual_metrics(aligned_ref, gain_matched, fs, freq, hmax)
+    metrics.update({"latency_samples": lag, "latency_ms": lag / fs * 1000.0, "gain_error_db": gain_error_db})
+    return metrics
@@ -1,42 +1,55 @@
+import functools
+
 import numpy as np
 from typing import Dict, Any
 
+from .jit import njit, prefer_aot
 
-def _envelope_follow(x: np.ndarray, fs: int, attack_ms: float, release_ms: float) -> np.ndarray:
-    """Simple envelope follower with attack/release time constants."""
-    attack_coeff = float(np.exp(-1.0 / (max(attack_ms, 1e-6) / 1000.0 * fs)))
-    release_coeff = float(np.exp(-1.0 / (max(release_ms, 1e-6) / 1000.0 * fs)))
-    env = np.zeros_like(x, dtype=np.float32)
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _envelope_kernel(mag: np.ndarray, attack_coeff: float, release_coeff: float) -> np.ndarray:
+    env = np.zeros(mag.shape[0], dtype=np.float32)
+    # (1 - coeff) hoisted out of the loop; this also keeps the interpreted
+    # fallback (no Numba) to one multiply-add pair per sample.
+    attack_rest = 1.0 - attack_coeff
+    release_rest = 1.0 - release_coeff
     last = 0.0
-    for i, sample in enumerate(np.abs(x)):
+    for i in range(mag.shape[0]):
+        sample = mag[i]
         if sample > last:
-            coeff = attack_coeff
+            last = attack_coeff * last + attack_rest * sample
         else:
-            coeff = release_coeff
-        last = coeff * last + (1.0 - coeff) * sample
+            last = release_coeff * last + release_rest * sample
         env[i] = last
     return env
 
 
-def _soft_knee_gain(level_db: float, threshold_db: float, ratio: float, knee_db: float) -> float:
-    """Gain computer implementing a soft knee if knee_db > 0."""
+_envelope_impl = prefer_aot("envelope_kernel", _envelope_kernel)
+
+
+def _envelope_follow(x: np.ndarray, fs: int, attack_ms: float, release_ms: float) -> np.ndarray:
+    """Simple envelope follower with attack/release time constants."""
+    attack_coeff = float(np.exp(-1.0 / (max(attack_ms, 1e-6) / 1000.0 * fs)))
+    release_coeff = float(np.exp(-1.0 / (max(release_ms, 1e-6) / 1000.0 * fs)))
+    # float64 input gives the kernel a single signature (the AOT build needs
+    # one); float32 captures may differ from the old path in the last bits.
+    mag = np.abs(np.ravel(x)).astype(np.float64)
+    return _envelope_impl(mag, attack_coeff, release_coeff).reshape(np.shape(x))
+
+
+def _soft_knee_gain_vec(level_db: np.ndarray, threshold_db: float, ratio: float, knee_db: float) -> np.ndarray:
+    """Gain computer (dB) over a whole level array; soft knee if knee_db > 0."""
+    slope = 1.0 / max(ratio, 1e-12) - 1.0
+    over = level_db - threshold_db
     if knee_db <= 0:
-        if level_db <= threshold_db:
-            return 0.0
-        compressed = threshold_db + (level_db - threshold_db) / max(ratio, 1e-12)
-        return compressed - level_db
+        return np.where(over > 0.0, over * slope, 0.0)
 
     lower = threshold_db - knee_db / 2.0
     upper = threshold_db + knee_db / 2.0
-    if level_db < lower:
-        return 0.0
-    if level_db > upper:
-        compressed = threshold_db + (level_db - threshold_db) / max(ratio, 1e-12)
-        return compressed - level_db
     # Within knee region: quadratic interpolation for smooth transition
     delta = level_db - lower
-    compressed = level_db + (1.0 / max(ratio, 1e-12) - 1.0) * (delta ** 2) / (2.0 * knee_db)
-    return compressed - level_db
+    gain = np.where(level_db > upper, over * slope, slope * np.square(delta) / (2.0 * knee_db))
+    return np.where(level_db < lower, 0.0, gain)
 
 
 def apply_compressor(
@@ -63,28 +76,34 @@ def apply_compressor(
         x_mono = x
 
     env = _envelope_follow(x_mono, fs, attack_ms, release_ms)
-    out = np.zeros_like(x_mono, dtype=np.float32)
-
-    for i, sample in enumerate(x_mono):
-        level = max(env[i], 1e-12)
-        level_db = 20.0 * np.log10(level)
-        gain_db = _soft_knee_gain(level_db, threshold_db, ratio, knee_db)
-        total_gain_db = gain_db + makeup_db
-        lin_gain = 10.0 ** (total_gain_db / 20.0)
-        out[i] = float(sample * lin_gain)
+    level_db = 20.0 * np.log10(np.maximum(env, 1e-12), dtype=np.float64)
+    gain_db = _soft_knee_gain_vec(level_db, threshold_db, ratio, knee_db)
+    # 10 ** (dB / 20) as a single exp ufunc over the array
+    lin_gain = np.exp((gain_db + makeup_db) * (np.log(10.0) / 20.0))
+    out = (x_mono * lin_gain).astype(np.float32)
 
     return out if x.ndim == 1 else out[:, None]
 
 
-def build_stepped_tone(freq: float, fs: int, amp_max: float = 1.36) -> Dict[str, Any]:
+def stepped_tone(amps: np.ndarray, seg_n: int, gap_n: int, omega: float) -> np.ndarray:
+    """float32 train of ``amps[k] * sin(omega * i)`` segments, each followed by a silent gap."""
+    # Every segment restarts the same sine; compute it once, scale it per slice
+    base = np.arange(seg_n) * omega
+    np.sin(base, out=base)
+    tx = np.zeros(len(amps) * (seg_n + gap_n), dtype=np.float32)
+    for k, a in enumerate(amps):
+        s0 = k * (seg_n + gap_n)
+        np.multiply(base, a, out=tx[s0 : s0 + seg_n])
+    return tx
+
+
+@functools.lru_cache(maxsize=4)
+def _build_stepped_tone_impl(freq: float, fs: int, amp_max: float) -> Dict[str, Any]:
     seg_dur, gap_dur = 0.25, 0.05
     amps = np.linspace(0.05, amp_max, 36)
     protect = amp_max
-    t_seg = np.linspace(0, seg_dur, int(fs * seg_dur), endpoint=False)
-    gap = np.zeros(int(fs * gap_dur))
-    tx = np.concatenate([
-        np.concatenate((min(a, protect) * np.sin(2 * np.pi * freq * t_seg), gap)) for a in amps
-    ])
+    seg_n = int(fs * seg_dur)
+    tx = stepped_tone(np.minimum(amps, protect), seg_n, int(fs * gap_dur), 2 * np.pi * freq * seg_dur / max(seg_n, 1))
     meta = {
         'seg_samples': int(seg_dur * fs),
         'gap_samples': int(gap_dur * fs),
@@ -92,7 +111,49 @@ def build_stepped_tone(freq: float, fs: int, amp_max: float = 1.36) -> Dict[str,
         'trim_lead': int(0.03 * fs),
         'trim_tail': int(0.01 * fs),
     }
-    return {'signal': tx.astype(np.float32), 'meta': meta}
+    tx.setflags(write=False)
+    amps.setflags(write=False)
+    return {'signal': tx, 'meta': meta}
+
+
+def build_stepped_tone(freq: float, fs: int, amp_max: float = 1.36) -> Dict[str, Any]:
+    """Stepped-level test tone; repeated settings share one read-only signal."""
+    cached = _build_stepped_tone_impl(float(freq), int(fs), float(amp_max))
+    return {'signal': cached['signal'], 'meta': dict(cached['meta'])}
+
+
+def linear_fit(x: np.ndarray, y: np.ndarray):
+    """Least-squares line ``y ≈ a * x + b`` in closed form (``np.polyfit(x, y, 1)``)."""
+    xm, ym = float(np.mean(x)), float(np.mean(y))
+    dx, dy = x - xm, y - ym
+    a = float(np.dot(dx, dy) / max(float(np.dot(dx, dx)), 1e-24))
+    return a, ym - a * xm
+
+
+def segment_rms_db(
+    sig: np.ndarray, seg_n: int, gap_n: int, n_segments: int, trim_lead: int, trim_tail: int
+) -> np.ndarray:
+    """RMS level (dB) of every trimmed tone segment of a stepped-tone capture.
+
+    Complete ``seg_n + gap_n`` periods are viewed as rows and reduced in one
+    pass; segments cut short by the end of the capture are averaged over the
+    samples they actually have (an empty segment reads as the -240 dB floor).
+    """
+
+    period = seg_n + gap_n
+    sig = np.asarray(sig)
+    n_full = min(n_segments, len(sig) // period)
+    rows = sig[: n_full * period].reshape((n_full, period) + sig.shape[1:])
+    blocks = rows[:, trim_lead : max(trim_lead, seg_n - trim_tail)]
+    blocks = blocks.reshape(n_full, int(np.prod(blocks.shape[1:]))).astype(np.float64, copy=False)
+    rms = np.zeros(n_segments)
+    rms[:n_full] = np.sqrt(np.einsum('ij,ij->i', blocks, blocks) / max(blocks.shape[1], 1))
+    for i in range(n_full, n_segments):
+        seg = sig[i * period : i * period + seg_n]
+        seg = seg[trim_lead : max(trim_lead, len(seg) - trim_tail)].ravel().astype(np.float64)
+        if seg.size:
+            rms[i] = np.sqrt(np.dot(seg, seg) / seg.size)
+    return 20 * np.log10(np.maximum(rms, 1e-12))
 
 
 def compression_curve(sig: np.ndarray, meta: Dict[str, Any], fs: int, freq: float) -> Dict[str, Any]:
@@ -102,21 +163,11 @@ def compression_curve(sig: np.ndarray, meta: Dict[str, Any], fs: int, freq: floa
     trim_lead = meta.get('trim_lead', int(0.03 * fs))
     trim_tail = meta.get('trim_tail', int(0.01 * fs))
 
-    rms_in_db, rms_out_db = [], []
-    for A, i in zip(amps, range(len(amps))):
-        s0 = i * (segN + gapN)
-        s1 = s0 + segN
-        seg = sig[s0:s1]
-        seg = seg[trim_lead:max(trim_lead, len(seg) - trim_tail)]
-        rin = max(A / np.sqrt(2), 1e-12)
-        rout = max(np.sqrt(np.mean(np.square(seg))), 1e-12)
-        rms_in_db.append(20 * np.log10(rin))
-        rms_out_db.append(20 * np.log10(rout))
-    rms_in_db = np.array(rms_in_db)
-    rms_out_db = np.array(rms_out_db)
+    rms_in_db = 20 * np.log10(np.maximum(np.asarray(amps) / np.sqrt(2), 1e-12))
+    rms_out_db = segment_rms_db(sig, segN, gapN, len(amps), trim_lead, trim_tail)
     diff = rms_out_db - rms_in_db
 
-    a_all, b_all = np.polyfit(rms_in_db, rms_out_db, 1)
+    a_all, b_all = linear_fit(rms_in_db, rms_out_db)
     gain_offset_db = float(np.mean(diff))
     slope_tol, spread_tol = 0.05, 1.0
     no_compression = (abs(a_all - 1.0) < slope_tol) and ((diff.max() - diff.min()) < spread_tol)
@@ -130,7 +181,7 @@ def compression_curve(sig: np.ndarray, meta: Dict[str, Any], fs: int, freq: floa
             no_compression = True
         else:
             x, y = rms_in_db[mask], rms_out_db[mask]
-            a, b = np.polyfit(x, y, 1)
+            a, b = linear_fit(x, y)
             ratio = 1.0 / max(a, 1e-12)
             thr = b / (1 - a) if abs(1 - a) > 1e-6 else np.nan
     return {
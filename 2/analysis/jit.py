@@ -0,0 +1,71 @@
+import os
+from typing import Callable, Optional
+
+# Keep Numba's on-disk cache next to the other generated artifacts instead of
+# the (possibly read-only) package directory. Must be set before importing numba.
+_BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+os.environ.setdefault("NUMBA_CACHE_DIR", os.path.join(_BASE_DIR, "out", "numba_cache"))
+
+try:  # Optional dependency: the DSP code falls back to plain Python/NumPy
+    import numba
+    _numba_error: Optional[Exception] = None
+except Exception as exc:  # pragma: no cover - best-effort fallback
+    numba = None  # type: ignore
+    _numba_error = exc
+
+NUMBA_AVAILABLE = numba is not None
+
+# ``prange`` degrades to ``range`` so parallel kernels still run without Numba
+prange = numba.prange if numba is not None else range
+
+# Ahead-of-time build of the stable kernels (see tools/build_ext.py). Loading
+# it is a single dlopen, with no JIT compile or cache lookup at start-up.
+AOT_MODULE = "g2_dsp"
+try:
+    from . import g2_dsp as _aot  # type: ignore
+except Exception:  # pragma: no cover - extension not built
+    _aot = None
+
+
+def njit(*args, **kwargs) -> Callable:
+    """``numba.njit`` when Numba is installed, otherwise a no-op decorator.
+
+    Usable both bare (``@njit``) and with options (``@njit(cache=True)``). The
+    undecorated function must stay valid Python so results are identical with
+    or without Numba.
+    """
+
+    if numba is not None:
+        return numba.njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda func: func
+
+
+def prefer_aot(name: str, func: Callable) -> Callable:
+    """Return the AOT-compiled ``g2_dsp.<name>`` if it was built, else ``func``."""
+    return getattr(_aot, name, func)
+
+
+def warmup() -> None:
+    """Compile (or load from cache) the JIT kernels using tiny dummy inputs.
+
+    Meant to run on a background thread at start-up so the first real
+    measurement does not stall on LLVM codegen. No-op without Numba.
+    """
+
+    if numba is None:
+        return
+    import numpy as np
+
+    from . import attack_release, compressor, live_measurements, thd
+
+    dummy = np.zeros(64, dtype=np.float32)
+    compressor._envelope_follow(dummy, 48000, 10.0, 100.0)
+    thd._band_power_impl(np.zeros(64), np.arange(2, 6, dtype=np.int64), 2)
+    live_measurements.recording_stats(dummy)
+    live_measurements._goertzel_mags(np.zeros(64), np.arange(1, 4, dtype=np.int64))
+    live_measurements.generate_thd_tone(1000.0, 0.5, 8000, duration=0.01)
+    live_measurements.generate_compressor_tone(1000.0, 800)
+    attack_release.generate_step_tone(1000.0, 8000, duration=0.01)
+    attack_release.first_crossing(dummy, 0.5, 'up')
@@ -1,19 +1,29 @@
+import atexit
+import concurrent.futures
 import csv
+import functools
 import os
+import queue
+import threading
 import time
-from typing import Dict, Any, Tuple
+from typing import Callable, Dict, Any, Optional, Tuple
 
 import numpy as np
 
-from analysis import thd
+from analysis import compressor, thd
+from analysis.jit import NUMBA_AVAILABLE, njit, prange
 from audio import wav_io
 
 BASE_DURATION = 2.0
 FS_DEFAULT = 48000
 
 
+def _live_dir(base_dir: str) -> str:
+    return os.path.join(base_dir, "out", "live")
+
+
 def _ensure_out_dir(base_dir: str) -> str:
-    out_dir = os.path.join(base_dir, "out", "live")
+    out_dir = _live_dir(base_dir)
     os.makedirs(out_dir, exist_ok=True)
     return out_dir
 
@@ -28,6 +38,69 @@ def save_artifacts(tag: str, tx: np.ndarray, rx: np.ndarray, fs: int, base_dir:
     return {"tx": tx_path, "rx": rx_path}
 
 
+# ----------------------------------------------------------------------
+# Background WAV writer: TX/RX artifacts are encoded and written on a small
+# pool so the next capture can start while the disk catches up.
+# ----------------------------------------------------------------------
+_IO_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="wav_writer")
+_pending_wavs: set = set()
+_pending_wavs_lock = threading.Lock()
+
+
+def _write_wav_logged(path: str, data: np.ndarray, fs: int, log: Optional[Callable[[str], None]]) -> bool:
+    ok = False
+    try:
+        ok = wav_io.write_wav(path, data, fs)
+    finally:
+        if not ok and log:
+            log(f"Không ghi được WAV '{path}'.")
+    return ok
+
+
+def save_artifacts_async(
+    tag: str,
+    tx: np.ndarray,
+    rx: np.ndarray,
+    fs: int,
+    base_dir: str,
+    log: Optional[Callable[[str], None]] = None,
+) -> Dict[str, str]:
+    """Like :func:`save_artifacts`, but both WAVs are written on a background pool.
+
+    The paths are returned immediately. Writable buffers are copied first, so
+    the caller may reuse its capture buffer for the next measurement; ``log``
+    (thread-safe) receives write failures.
+    """
+
+    out_dir = _ensure_out_dir(base_dir)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    paths = {
+        "tx": os.path.join(out_dir, f"{tag}_{stamp}_tx.wav"),
+        "rx": os.path.join(out_dir, f"{tag}_{stamp}_rx.wav"),
+    }
+    for key, data in (("tx", tx), ("rx", rx)):
+        data = np.asarray(data)
+        if data.flags.writeable:
+            data = data.copy()
+        future = _IO_POOL.submit(_write_wav_logged, paths[key], data, fs, log)
+        with _pending_wavs_lock:
+            _pending_wavs.add(future)
+        future.add_done_callback(_forget_wav_write)
+    return paths
+
+
+def _forget_wav_write(future: concurrent.futures.Future) -> None:
+    with _pending_wavs_lock:
+        _pending_wavs.discard(future)
+
+
+def flush_wav_writes() -> None:
+    """Block until every queued artifact WAV has been written."""
+    with _pending_wavs_lock:
+        pending = list(_pending_wavs)
+    concurrent.futures.wait(pending)
+
+
 def append_csv_row(row: Tuple[str, ...], base_dir: str, filename: str = "ket_qua_do.csv") -> str:
     out_dir = _ensure_out_dir(base_dir)
     path = os.path.join(out_dir, filename)
@@ -37,28 +110,205 @@ def append_csv_row(row: Tuple[str, ...], base_dir: str, filename: str = "ket_qua
     return path
 
 
+# ----------------------------------------------------------------------
+# Background CSV writer: measurement threads only enqueue rows; a daemon
+# drains them in batches through long-lived append handles.
+# ----------------------------------------------------------------------
+_csv_queue: "queue.Queue" = queue.Queue()
+_csv_thread: Optional[threading.Thread] = None
+_csv_thread_lock = threading.Lock()
+
+
+def _csv_writer_loop() -> None:
+    handles: Dict[str, Any] = {}
+    while True:
+        batch = [_csv_queue.get()]
+        while True:
+            try:
+                batch.append(_csv_queue.get_nowait())
+            except queue.Empty:
+                break
+        touched = set()
+        try:
+            for path, row, log in batch:
+                try:
+                    f = handles.get(path)
+                    if f is None:
+                        os.makedirs(os.path.dirname(path), exist_ok=True)
+                        f = handles[path] = open(path, "a", newline="", encoding="utf-8")
+                    csv.writer(f).writerow(row)
+                    touched.add(path)
+                except Exception as exc:
+                    # one bad row (unwritable path, unencodable value) must
+                    # not kill the writer thread and hang flush_csv_writes()
+                    bad = handles.pop(path, None)
+                    if bad is not None:
+                        try:
+                            bad.close()
+                        except Exception:
+                            pass
+                    if log:
+                        try:
+                            log(f"Không ghi được CSV '{path}': {exc}")
+                        except Exception:
+                            pass
+            for path in touched:
+                try:
+                    handles[path].flush()  # one write syscall per batch and file
+                except Exception:
+                    handles.pop(path, None)
+        finally:
+            for _ in batch:
+                _csv_queue.task_done()
+
+
+def append_csv_row_async(
+    row: Tuple[str, ...],
+    base_dir: str,
+    filename: str = "ket_qua_do.csv",
+    log: Optional[Callable[[str], None]] = None,
+) -> str:
+    """Queue ``row`` for :func:`append_csv_row`-style writing and return the path.
+
+    The write happens on a daemon thread, so a slow disk never holds up the
+    measurement. ``log`` (thread-safe) receives write errors.
+    """
+
+    global _csv_thread
+    path = os.path.join(_live_dir(base_dir), filename)
+    with _csv_thread_lock:
+        if _csv_thread is None:
+            _csv_thread = threading.Thread(target=_csv_writer_loop, name="csv_writer", daemon=True)
+            _csv_thread.start()
+            atexit.register(flush_csv_writes)
+    _csv_queue.put((path, tuple(row), log))
+    return path
+
+
+def flush_csv_writes() -> None:
+    """Block until every queued CSV row has been written."""
+    if _csv_thread is not None:
+        _csv_queue.join()
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _stats_kernel(flat: np.ndarray):
+    mn = flat[0]
+    mx = flat[0]
+    sumsq = 0.0
+    clips = 0
+    for i in range(flat.shape[0]):
+        x = flat[i]
+        if x < mn:
+            mn = x
+        if x > mx:
+            mx = x
+        sumsq += x * x
+        if abs(x) >= 0.999:
+            clips += 1
+    return mn, mx, sumsq, clips
+
+
+def recording_stats(flat: np.ndarray) -> Dict[str, Any]:
+    """Min/max/RMS/clip count of a non-empty 1-D capture.
+
+    With Numba this is a single fused pass over the buffer; otherwise it uses
+    the equivalent NumPy reductions.
+    """
+
+    flat = np.ascontiguousarray(flat, dtype=np.float32)
+    if NUMBA_AVAILABLE:
+        mn, mx, sumsq, clips = _stats_kernel(flat)
+        rms = np.sqrt(sumsq / flat.size)
+    else:
+        mn, mx = flat.min(), flat.max()
+        # einsum accumulates in float64 chunk by chunk: no squared temporary
+        rms = np.sqrt(np.einsum('i,i->', flat, flat, dtype=np.float64) / flat.size)
+        clips = np.sum(np.abs(flat) >= 0.999)
+    return {"min": float(mn), "max": float(mx), "rms": float(rms), "clips": int(clips)}
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _thd_tone_kernel(n: int, amp: float, omega: float) -> np.ndarray:
+    out = np.zeros((n, 2), dtype=np.float32)
+    for i in range(n):
+        out[i, 0] = amp * np.sin(omega * i)
+    return out
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def _stepped_tone_kernel(amps: np.ndarray, seg_n: int, gap_n: int, omega: float) -> np.ndarray:
+    out = np.zeros(amps.shape[0] * (seg_n + gap_n), dtype=np.float32)
+    for k in range(amps.shape[0]):
+        base = k * (seg_n + gap_n)
+        for i in range(seg_n):
+            out[base + i] = amps[k] * np.sin(omega * i)
+    return out
+
+
 def generate_thd_tone(freq: float, amp: float, fs: int, duration: float = BASE_DURATION) -> np.ndarray:
-    t = np.linspace(0, duration, int(fs * duration), endpoint=False)
-    sine = amp * np.sin(2 * np.pi * freq * t)
-    return np.column_stack((sine, np.zeros_like(sine))).astype(np.float32)
+    n = int(fs * duration)
+    if NUMBA_AVAILABLE and n > 0:
+        # Fill the float32 stereo buffer in one pass instead of via t/sin temporaries
+        return _thd_tone_kernel(n, float(amp), 2 * np.pi * freq * duration / n)
+    tone = np.zeros((n, 2), dtype=np.float32)
+    # phase stays float64 (float32 phase drifts audibly over a 2 s tone)
+    sine = np.arange(n) * (2 * np.pi * freq * duration / max(n, 1))
+    np.sin(sine, out=sine)
+    sine *= amp
+    tone[:, 0] = sine
+    return tone
+
+
+def _thd_from_bin_mags(mags: np.ndarray) -> Tuple[Dict[int, float], float, float]:
+    """Harmonic dBc table, THD % and THD dB from |X| at the fundamental, H2, H3...
+
+    THD stays linear (norm of the harmonic magnitudes over the fundamental)
+    instead of round-tripping every harmonic through dB.
+    """
+    ratios = (np.asarray(mags[1:], dtype=np.float64) + 1e-12) / float(mags[0] + 1e-12)
+    harmonics: Dict[int, float] = dict(zip(range(2, len(mags) + 1), 20 * np.log10(ratios)))
+    thd_ratio = np.sqrt(np.dot(ratios, ratios))
+    thd_percent = thd_ratio * 100.0
+    thd_db = 20 * np.log10(thd_ratio + 1e-12)
+    return harmonics, thd_percent, thd_db
 
 
 def _harmonic_metrics(signal: np.ndarray, fs: int, freq: float, max_h: int) -> Tuple[Dict[int, float], float, float]:
     n = len(signal)
-    windowed = signal * np.hanning(n)
+    windowed = signal * thd.get_window(n)
     fft = np.fft.rfft(windowed)
     mag = np.abs(fft)
-    freqs = np.fft.rfftfreq(n, 1 / fs)
-    fund_idx = int(np.argmin(np.abs(freqs - freq)))
-    fund_mag = float(mag[fund_idx] + 1e-12)
-    harmonics: Dict[int, float] = {}
-    for h in range(2, max_h + 1):
-        idx = int(np.argmin(np.abs(freqs - h * freq)))
-        harmonics[h] = 20 * np.log10(float(mag[idx] + 1e-12) / fund_mag)
-    thd_ratio = np.sqrt(np.sum([10 ** (v / 10.0) for v in harmonics.values()]))
-    thd_percent = thd_ratio * 100.0
-    thd_db = 20 * np.log10(thd_ratio + 1e-12)
-    return harmonics, thd_percent, thd_db
+    bins = thd.nearest_bins(np.arange(1, max_h + 1) * freq, n, fs)
+    return _thd_from_bin_mags(mag[bins])
+
+
+@njit(parallel=True, cache=True, fastmath=True, nogil=True)
+def _goertzel_mags(x: np.ndarray, bins: np.ndarray) -> np.ndarray:
+    """|DFT| of ``x`` at the integer ``bins`` via the Goertzel recurrence."""
+    n = x.shape[0]
+    out = np.zeros(bins.shape[0])
+    for k in prange(bins.shape[0]):
+        coeff = 2.0 * np.cos(2.0 * np.pi * bins[k] / n)
+        s1 = 0.0
+        s2 = 0.0
+        for i in range(n):
+            s0 = x[i] + coeff * s1 - s2
+            s2 = s1
+            s1 = s0
+        out[k] = np.sqrt(max(s1 * s1 + s2 * s2 - coeff * s1 * s2, 0.0))
+    return out
+
+
+def _harmonic_metrics_goertzel(
+    signal: np.ndarray, fs: int, freq: float, max_h: int
+) -> Tuple[Dict[int, float], float, float]:
+    """Same result as :func:`_harmonic_metrics`, evaluating only the needed bins."""
+    n = len(signal)
+    windowed = np.ascontiguousarray(signal * thd.get_window(n), dtype=np.float64)
+    bins = thd.nearest_bins(np.arange(1, max_h + 1) * freq, n, fs)
+    mag = _goertzel_mags(windowed, bins)
+    return _thd_from_bin_mags(mag)
 
 
 def analyze_thd_capture(recorded: np.ndarray, fs: int, freq: float, hmax: int) -> Dict[str, Any]:
@@ -66,7 +316,12 @@ def analyze_thd_capture(recorded: np.ndarray, fs: int, freq: float, hmax: int) -
     trimmed = trimmed[int(0.05 * fs) :]
     peak = float(np.max(np.abs(trimmed)) + 1e-12)
     normalized = trimmed / peak
-    harmonics, thd_percent, thd_db = _harmonic_metrics(normalized, fs, freq, hmax)
+    # A handful of known bins is cheaper through compiled Goertzel than a
+    # second full FFT; without Numba the FFT path stays faster.
+    if NUMBA_AVAILABLE and hmax <= 16 and len(normalized) >= 4096:
+        harmonics, thd_percent, thd_db = _harmonic_metrics_goertzel(normalized, fs, freq, hmax)
+    else:
+        harmonics, thd_percent, thd_db = _harmonic_metrics(normalized, fs, freq, hmax)
     thd_metrics = thd.compute_thd(normalized, fs, freq, hmax)
     thd_metrics.update({
         "harmonics_manual": harmonics,
@@ -77,13 +332,16 @@ def analyze_thd_capture(recorded: np.ndarray, fs: int, freq: float, hmax: int) -
     return thd_metrics
 
 
-def generate_compressor_tone(freq: float, fs: int, amp_max: float = 1.36) -> Dict[str, Any]:
+@functools.lru_cache(maxsize=4)
+def _compressor_tone_impl(freq: float, fs: int, amp_max: float) -> Dict[str, Any]:
     seg_dur, gap_dur = 0.25, 0.05
     amps = np.linspace(0.05, amp_max, 36)
     protect = amp_max
-    t_seg = np.linspace(0, seg_dur, int(fs * seg_dur), endpoint=False)
-    gap = np.zeros(int(fs * gap_dur))
-    tx = np.concatenate([np.concatenate((min(a, protect) * np.sin(2 * np.pi * freq * t_seg), gap)) for a in amps])
+    seg_n, gap_n = int(fs * seg_dur), int(fs * gap_dur)
+    if NUMBA_AVAILABLE and seg_n > 0:
+        tx = _stepped_tone_kernel(np.minimum(amps, protect), seg_n, gap_n, 2 * np.pi * freq * seg_dur / seg_n)
+    else:
+        tx = compressor.stepped_tone(np.minimum(amps, protect), seg_n, gap_n, 2 * np.pi * freq * seg_dur / max(seg_n, 1))
     meta = {
         "seg_samples": int(seg_dur * fs),
         "gap_samples": int(gap_dur * fs),
@@ -91,7 +349,19 @@ def generate_compressor_tone(freq: float, fs: int, amp_max: float = 1.36) -> Dic
         "trim_lead": int(0.03 * fs),
         "trim_tail": int(0.01 * fs),
     }
-    return {"signal": tx.astype(np.float32), "meta": meta}
+    tx = np.asarray(tx, dtype=np.float32)
+    tx.setflags(write=False)
+    amps.setflags(write=False)
+    return {"signal": tx, "meta": meta}
+
+
+def generate_compressor_tone(freq: float, fs: int, amp_max: float = 1.36) -> Dict[str, Any]:
+    """Stepped compressor stimulus; repeated settings share one read-only signal.
+
+    Copy ``signal`` before modifying it in place.
+    """
+    cached = _compressor_tone_impl(float(freq), int(fs), float(amp_max))
+    return {"signal": cached["signal"], "meta": dict(cached["meta"])}
 
 
 def analyze_compressor_capture(sig: np.ndarray, meta: Dict[str, Any], fs: int) -> Dict[str, Any]:
@@ -100,21 +370,10 @@ def analyze_compressor_capture(sig: np.ndarray, meta: Dict[str, Any], fs: int) -
     amps = meta["amps"]
     trim_lead, trim_tail = meta.get("trim_lead", int(0.03 * fs)), meta.get("trim_tail", int(0.01 * fs))
 
-    rms_in_db, rms_out_db = [], []
-    for idx, amp in enumerate(amps):
-        s0 = idx * (seg_n + gap_n)
-        s1 = s0 + seg_n
-        seg = sig[s0:s1]
-        seg = seg[trim_lead : max(trim_lead, len(seg) - trim_tail)]
-        rin = max(amp / np.sqrt(2), 1e-12)
-        rout = max(np.sqrt(np.mean(np.square(seg))), 1e-12)
-        rms_in_db.append(20 * np.log10(rin))
-        rms_out_db.append(20 * np.log10(rout))
-
-    rms_in_db = np.array(rms_in_db)
-    rms_out_db = np.array(rms_out_db)
+    rms_in_db = 20 * np.log10(np.maximum(np.asarray(amps) / np.sqrt(2), 1e-12))
+    rms_out_db = compressor.segment_rms_db(sig, seg_n, gap_n, len(amps), trim_lead, trim_tail)
     diff = rms_out_db - rms_in_db
-    a_all, b_all = np.polyfit(rms_in_db, rms_out_db, 1)
+    a_all, b_all = compressor.linear_fit(rms_in_db, rms_out_db)
     gain_offset_db = float(np.mean(diff))
     slope_tol, spread_tol = 0.05, 1.0
     no_compression = (abs(a_all - 1.0) < slope_tol) and ((diff.max() - diff.min()) < spread_tol)
@@ -124,7 +383,7 @@ def analyze_compressor_capture(sig: np.ndarray, meta: Dict[str, Any], fs: int) -
         mask = diff < -0.5
         if np.count_nonzero(mask) >= 2:
             x, y = rms_in_db[mask], rms_out_db[mask]
-            a, b = np.polyfit(x, y, 1)
+            a, b = compressor.linear_fit(x, y)
             ratio = 1.0 / max(a, 1e-12)
             thr = b / (1 - a) if abs(1 - a) > 1e-6 else np.nan
         else:
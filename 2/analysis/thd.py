@@ -1,7 +1,55 @@
+import functools
 import os
 import numpy as np
 from typing import Dict, Any, Optional
 
+from .jit import njit, prange, prefer_aot
+
+
+@njit(parallel=True, cache=True, fastmath=True, nogil=True)
+def _harmonic_band_power(power: np.ndarray, harmonic_idx: np.ndarray, half_window: int) -> np.ndarray:
+    """Sum ``power`` over ``idx ± half_window`` for every harmonic bin (DC excluded)."""
+    n = power.shape[0]
+    out = np.zeros(harmonic_idx.shape[0])
+    for k in prange(harmonic_idx.shape[0]):
+        start = max(harmonic_idx[k] - half_window, 1)
+        stop = min(harmonic_idx[k] + half_window + 1, n)
+        acc = 0.0
+        for j in range(start, stop):
+            acc += power[j]
+        out[k] = acc
+    return out
+
+
+_band_power_impl = prefer_aot("harmonic_band_power", _harmonic_band_power)
+
+
+@functools.lru_cache(maxsize=8)
+def get_window(n: int, kind: Optional[str] = "hann") -> np.ndarray:
+    """Read-only analysis window of length ``n``, shared between calls."""
+    if kind == "hann" or kind == "hanning":
+        win = np.hanning(n)
+    elif kind is None or kind == "none":
+        win = np.ones(n)
+    else:
+        raise ValueError(f"Unsupported window '{kind}'")
+    win.flags.writeable = False
+    return win
+
+
+@functools.lru_cache(maxsize=16)
+def get_rfftfreq(nfft: int, fs: float) -> np.ndarray:
+    """Read-only ``np.fft.rfftfreq(nfft, 1 / fs)``, shared between calls."""
+    freqs = np.fft.rfftfreq(nfft, 1 / fs)
+    freqs.flags.writeable = False
+    return freqs
+
+
+def nearest_bins(freqs_hz, nfft: int, fs: float) -> np.ndarray:
+    """Nearest rfft bin index for each frequency (ties resolve low, like argmin)."""
+    bins = np.ceil(np.asarray(freqs_hz, dtype=np.float64) * nfft / fs - 0.5)
+    return np.clip(bins, 0, nfft // 2).astype(np.int64)
+
 
 def normalize_thd_result(data: Dict[str, Any], fallback_db: float = 0.0) -> Dict[str, Any]:
     """Normalize THD/THD+N result keys and guarantee required fields.
@@ -52,28 +100,26 @@ def compute_thd(
     """
 
     sig = np.asarray(signal, dtype=np.float32)
-    sig = sig - np.mean(sig)
+    # DC is taken over all channels (as before), but only channel 0 is ever
+    # materialized: one working buffer, de-meaned and windowed in place. A
+    # (planar) memmapped capture is read straight from its pages.
+    mean = np.mean(sig, dtype=np.float32)
     if sig.ndim > 1:
         sig = sig[:, 0]
 
     nfft_use = int(nfft) if nfft else len(sig)
-    if window == "hann" or window == "hanning":
-        win = np.hanning(len(sig))
-    elif window is None or window == "none":
-        win = np.ones(len(sig))
-    else:
-        raise ValueError(f"Unsupported window '{window}'")
-
-    windowed = sig * win
+    windowed = np.empty(len(sig))
+    np.subtract(sig, mean, out=windowed, dtype=np.float32)  # float32 math, float64 store
+    windowed *= get_window(len(sig), window)
     spec = np.fft.rfft(windowed, n=nfft_use)
-    freqs = np.fft.rfftfreq(nfft_use, 1 / fs)
+    freqs = get_rfftfreq(nfft_use, fs)
     mag = np.abs(spec)
     power = mag ** 2
     # Avoid DC contamination
     if power.size:
         power[0] = 0.0
 
-    fund_idx = int(np.argmin(np.abs(freqs - freq)))
+    fund_idx = int(nearest_bins(freq, nfft_use, fs))
     band_bins = int(max(1, fundamental_band_bins))
     band_start = max(fund_idx - band_bins, 1)
     band_stop = min(fund_idx + band_bins + 1, len(power))
@@ -81,13 +127,14 @@ def compute_thd(
     fund_power = float(np.sum(power[fund_band]) + 1e-24)
     fund_mag = np.sqrt(fund_power)
 
+    orders = range(2, max_h + 1)
+    harmonic_idx = nearest_bins(np.arange(2, max_h + 1) * freq, nfft_use, fs)
+    band_power = _band_power_impl(np.ascontiguousarray(power, dtype=np.float64), harmonic_idx, band_bins)
+
     harmonics: Dict[int, float] = {}
     power_sum = 0.0
-    for h in range(2, max_h + 1):
-        idx = np.argmin(np.abs(freqs - h * freq))
-        h_start = max(idx - band_bins, 1)
-        h_stop = min(idx + band_bins + 1, len(power))
-        h_power = float(np.sum(power[h_start:h_stop]))
+    for h, h_power in zip(orders, band_power):
+        h_power = float(h_power)
         power_sum += h_power
         h_ratio = np.sqrt(h_power / fund_power) if fund_power > 0 else 0.0
         harmonics[h] = 20 * np.log10(h_ratio + 1e-12)
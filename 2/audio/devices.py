@@ -1,5 +1,6 @@
-import json
-import hashlib
+import threading
+import time
+import zlib
 from typing import List, Optional, Tuple
 
 try:  # Optional dependency: sounddevice may be absent in offline environments
@@ -9,6 +10,49 @@ except Exception as exc:  # pragma: no cover - best-effort fallback
     sd = None  # type: ignore
     _sd_error = exc
 
+DEVICE_CACHE_TTL = 0.5  # seconds a PortAudio enumeration is reused
+
+_query_lock = threading.Lock()
+_query_cache: Optional[Tuple[float, object]] = None
+
+
+def cached_query_devices(ttl: float = DEVICE_CACHE_TTL):
+    """``sd.query_devices()``, reused for ``ttl`` seconds.
+
+    Enumeration can rescan the hardware (slow on WASAPI), so lookups made
+    during one refresh share a single scan. Raises like ``sd.query_devices``.
+    """
+
+    global _query_cache
+    with _query_lock:
+        now = time.monotonic()
+        if _query_cache is not None and now - _query_cache[0] < ttl:
+            return _query_cache[1]
+        raw_devices = sd.query_devices()
+        _query_cache = (now, raw_devices)
+        return raw_devices
+
+
+def invalidate_device_cache() -> None:
+    """Force the next lookup to enumerate again (hotplug, manual refresh)."""
+
+    global _query_cache
+    with _query_lock:
+        _query_cache = None
+
+
+def split_devices(raw_devices) -> Tuple[List[str], List[str]]:
+    """Split an already fetched ``sd.query_devices()`` list into (inputs, outputs)."""
+
+    inputs, outputs = [], []
+    for i, dev in enumerate(raw_devices):
+        name = f"{i}: {dev['name']}"
+        if dev.get("max_input_channels", 0) > 0:
+            inputs.append(name)
+        if dev.get("max_output_channels", 0) > 0:
+            outputs.append(name)
+    return inputs, outputs
+
 
 def list_devices(raise_on_error: bool = False) -> Tuple[List[str], List[str]]:
     """Return (inputs, outputs) as display strings.
@@ -17,20 +61,28 @@ def list_devices(raise_on_error: bool = False) -> Tuple[List[str], List[str]]:
     caller can log it; otherwise silently returns empty lists on failure.
     """
 
-    inputs, outputs = [], []
     if sd is None:
-        return inputs, outputs
+        return [], []
     try:
-        for i, dev in enumerate(sd.query_devices()):
-            name = f"{i}: {dev['name']}"
-            if dev.get("max_input_channels", 0) > 0:
-                inputs.append(name)
-            if dev.get("max_output_channels", 0) > 0:
-                outputs.append(name)
+        return split_devices(cached_query_devices())
     except Exception:
         if raise_on_error:
             raise
-    return inputs, outputs
+    return [], []
+
+
+def devices_signature(raw_devices) -> str:
+    """Fingerprint of an already fetched device list for change detection.
+
+    CRC32 over the (index, name, channel counts) tuples: cheap enough to run on
+    every refresh poll. It only tells lists apart; it is not a secure hash.
+    """
+
+    payload = [
+        (i, dev.get("name", ""), dev.get("max_input_channels", 0), dev.get("max_output_channels", 0))
+        for i, dev in enumerate(raw_devices)
+    ]
+    return format(zlib.crc32(repr(payload).encode()), "08x")
 
 
 def get_devices_signature() -> Optional[str]:
@@ -39,13 +91,7 @@ def get_devices_signature() -> Optional[str]:
     if sd is None:
         return None
     try:
-        devs = sd.query_devices()
-        payload = [
-            (i, dev.get("name", ""), dev.get("max_input_channels", 0), dev.get("max_output_channels", 0))
-            for i, dev in enumerate(devs)
-        ]
-        blob = json.dumps(payload, sort_keys=True).encode()
-        return hashlib.sha256(blob).hexdigest()
+        return devices_signature(cached_query_devices())
     except Exception:
         return None
 
@@ -61,7 +107,9 @@ def default_samplerate(out_dev):
     if sd is None:
         return 48000
     try:
-        dev_info = sd.query_devices(out_dev, 'output')
+        dev_info = cached_query_devices()[out_dev]
+        if dev_info.get('max_output_channels', 0) <= 0:
+            raise ValueError(f"device {out_dev} has no outputs")
         return int(dev_info['default_samplerate'])
     except Exception:
         try:
@@ -18,6 +18,7 @@ def play_and_record(
     log=None,
     input_channels: int = 1,
 ):
+    """Play ``signal`` while recording; returns the float32 capture or None."""
     if sd is None:
         if log:
             log(f"play_and_record unavailable: { _sd_error }")
@@ -1,4 +1,6 @@
 import numpy as np
+import os
+import struct
 import wave
 from typing import Tuple, Optional
 
@@ -9,48 +11,208 @@ try:
 except Exception:
     sf = None
 
+# soundfile reports bad paths/formats as RuntimeError subclasses (LibsndfileError)
+_SF_ERRORS = (RuntimeError, OSError, TypeError, ValueError) + (
+    (sf.SoundFileError,) if sf is not None and hasattr(sf, "SoundFileError") else ()
+)
 
-def read_wav(path: str) -> Tuple[Optional[int], Optional[np.ndarray]]:
-    if sf is not None:
-        try:
-            data, fs = sf.read(path, always_2d=False)
-            data = data.astype(np.float32)
-            return fs, data
-        except Exception:
-            pass
+WRITE_BLOCK_FRAMES = 65536  # frames converted to PCM per write when streaming
+READ_BLOCK_BYTES = 1 << 20  # PCM bytes decoded per step in the wave fallback
+
+# (format tag, bits per sample) -> (little-endian dtype, scale to [-1, 1))
+_MEMMAP_FORMATS = {
+    (1, 16): ('<i2', 1.0 / 32768.0),
+    (1, 32): ('<i4', 1.0 / 2147483648.0),
+    (3, 32): ('<f4', None),
+}
+
+
+def _wav_layout(path: str) -> Optional[Tuple[int, int, int, int, int, int]]:
+    """Parse the RIFF header: ``(tag, channels, fs, bits, data_offset, data_bytes)``."""
+    with open(path, 'rb') as f:
+        riff = f.read(12)
+        if len(riff) < 12 or riff[:4] != b'RIFF' or riff[8:12] != b'WAVE':
+            return None
+        fmt = None
+        while True:
+            hdr = f.read(8)
+            if len(hdr) < 8:
+                return None
+            chunk_id, size = hdr[:4], struct.unpack('<I', hdr[4:])[0]
+            if chunk_id == b'data':
+                if fmt is None:
+                    return None
+                offset = f.tell()
+                size = min(size, os.fstat(f.fileno()).st_size - offset)
+                return fmt + (offset, size)
+            if chunk_id == b'fmt ':
+                body = f.read(size)
+                if len(body) < 16:
+                    return None
+                tag, channels, fs, _, _, bits = struct.unpack('<HHIIHH', body[:16])
+                if tag == 0xFFFE and len(body) >= 26:  # WAVE_FORMAT_EXTENSIBLE
+                    tag = struct.unpack('<H', body[24:26])[0]
+                fmt = (tag, channels, fs, bits)
+            else:
+                f.seek(size, 1)
+            if size % 2:
+                f.seek(1, 1)
+
+
+def _read_wav_memmap(path: str) -> Tuple[Optional[int], Optional[np.ndarray]]:
+    """Map the PCM ``data`` chunk instead of reading it into a bytes buffer.
+
+    Mono IEEE float32 files are returned as a copy-on-write memmap
+    (zero-copy); integer PCM is scaled to float32 straight from the mapped
+    pages. Multi-channel data comes back planar (see :func:`read_wav`).
+    Unsupported layouts (e.g. 24-bit) return ``(None, None)``.
+    """
+
+    layout = _wav_layout(path)
+    if layout is None:
+        return None, None
+    tag, channels, fs, bits, offset, nbytes = layout
+    spec = _MEMMAP_FORMATS.get((tag, bits))
+    if spec is None or channels < 1:
+        return None, None
+    dtype, scale = spec
+    frames = nbytes // (channels * np.dtype(dtype).itemsize)
+    if frames == 0:
+        return fs, np.zeros(0 if channels == 1 else (0, channels), dtype=np.float32)
+    shape = (frames,) if channels == 1 else (frames, channels)
+    raw = np.memmap(path, dtype=dtype, mode='c' if scale is None else 'r', offset=offset, shape=shape)
+    if scale is None:
+        return fs, raw if channels == 1 else np.asfortranarray(raw)
+    # order='F' de-interleaves while scaling: no extra pass for the transpose
+    return fs, np.multiply(raw, np.float32(scale), dtype=np.float32, order='F')
+
+
+def _read_soundfile(path: str) -> Tuple[Optional[int], Optional[np.ndarray]]:
+    try:
+        data, fs = sf.read(path, always_2d=False)
+    except _SF_ERRORS:
+        return None, None
+    return fs, data.astype(np.float32, order='F')
+
+
+def _read_wave(path: str) -> Tuple[Optional[int], Optional[np.ndarray]]:
     try:
         with wave.open(path, 'rb') as wf:
             fs = wf.getframerate()
-            frames = wf.readframes(wf.getnframes())
-            data = np.frombuffer(frames, dtype=np.int16).astype(np.float32) / 32768.0
             channels = wf.getnchannels()
-            if channels > 1:
-                data = data.reshape(-1, channels)
+            data = np.empty((wf.getnframes(), channels), dtype=np.float32, order='F')
+            # Decode ~1 MB of PCM at a time into the final buffer instead of
+            # holding the whole file as bytes + int16 + float32 at once.
+            block = max(1, READ_BLOCK_BYTES // (2 * channels))
+            pos = 0
+            while pos < len(data):
+                src = np.frombuffer(wf.readframes(block), dtype='<i2')
+                if src.size < channels:
+                    break
+                src = src[: (len(data) - pos) * channels].reshape(-1, channels)
+                # one fused int16 -> float32 scaling pass (2**-15 is exact),
+                # de-interleaved straight into the planar buffer
+                np.multiply(src, np.float32(1.0 / 32768.0), out=data[pos : pos + len(src)])
+                pos += len(src)
+    except (wave.Error, EOFError, OSError, ValueError):
+        return None, None
+    data = data[:pos]
+    return fs, data[:, 0] if channels == 1 else data
+
+
+def read_wav(path: str) -> Tuple[Optional[int], Optional[np.ndarray]]:
+    """Decode ``path`` to float32: ``(frames,)`` mono or ``(frames, channels)``.
+
+    Multi-channel arrays are Fortran-ordered, so every ``data[:, ch]`` is a
+    unit-stride channel ready for FFT/BLAS without a gather copy.
+    """
+    try:
+        fs, data = _read_wav_memmap(path)
+        if fs is not None:
             return fs, data
-    except Exception:
+    except (FileNotFoundError, IsADirectoryError, PermissionError):
+        # the header open failed; any backend would fail the same way
         return None, None
-    return None, None
+    except Exception:
+        pass
+    return _READ_IMPL(path)
 
 
-def write_wav(path: str, data: np.ndarray, fs: int) -> bool:
-    if sf is not None:
+class WavWriter:
+    """Incremental 16-bit PCM WAV writer.
+
+    Blocks are clipped and converted one at a time, so only a block-sized
+    int16 buffer ever exists; the RIFF sizes are patched on :meth:`close`.
+    """
+
+    def __init__(self, path: str, fs: int, channels: int = 1):
+        self.channels = int(channels)
+        self._wf = wave.open(path, 'wb')
         try:
-            sf.write(path, data, fs)
-            return True
-        except Exception:
-            pass
+            self._wf.setnchannels(self.channels)
+            self._wf.setsampwidth(2)
+            self._wf.setframerate(int(fs))
+        except BaseException:
+            # no __exit__ runs for a failed constructor: release the file here
+            try:
+                self._wf.close()
+            except wave.Error:
+                pass  # the header can't be written without the parameters
+            raise
+        self._scratch = np.empty(0, dtype=np.float32)
+        # native order: wave itself byteswaps to little-endian on BE hosts
+        self._pcm = np.empty(0, dtype=np.int16)
+
+    def write_block(self, block: np.ndarray) -> None:
+        block = np.asarray(block)
+        if block.size == 0:
+            return
+        if self._scratch.shape != block.shape:
+            self._scratch = np.empty(block.shape, dtype=np.float32)
+            self._pcm = np.empty(block.shape, dtype=np.int16)
+        # scale, clip and truncate in place in block-sized buffers reused
+        # across calls; same values as (clip(x, -1, 1) * 32767).astype(int16)
+        np.multiply(block, np.float32(32767.0), out=self._scratch, dtype=np.float32, casting='unsafe')
+        np.clip(self._scratch, -32767.0, 32767.0, out=self._scratch)
+        np.copyto(self._pcm, self._scratch, casting='unsafe')
+        # wave accepts any buffer and writes it without a bytes copy
+        self._wf.writeframesraw(memoryview(self._pcm))
+
+    def close(self) -> None:
+        self._wf.close()
+
+    def __enter__(self) -> "WavWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _write_soundfile(path: str, data: np.ndarray, fs: int) -> bool:
     try:
-        scaled = np.clip(data, -1.0, 1.0)
-        scaled = (scaled * 32767).astype('<i2')
-        with wave.open(path, 'wb') as wf:
-            if scaled.ndim == 1:
-                channels = 1
-            else:
-                channels = scaled.shape[1]
-            wf.setnchannels(channels)
-            wf.setsampwidth(2)
-            wf.setframerate(fs)
-            wf.writeframes(scaled.tobytes())
-        return True
-    except Exception:
+        sf.write(path, data, fs)
+    except _SF_ERRORS:
+        return False
+    return True
+
+
+def _write_wave(path: str, data: np.ndarray, fs: int) -> bool:
+    try:
+        channels = 1 if np.ndim(data) == 1 else np.shape(data)[1]
+        with WavWriter(path, fs, channels) as writer:
+            for start in range(0, len(data), WRITE_BLOCK_FRAMES):
+                writer.write_block(data[start : start + WRITE_BLOCK_FRAMES])
+    except (wave.Error, OSError, ValueError):
         return False
+    return True
+
+
+# Backend picked once at import: soundfile when installed, else the stdlib
+# wave module. A soundfile failure is final; retrying with wave would only
+# reopen the same file.
+_READ_IMPL = _read_soundfile if sf is not None else _read_wave
+_WRITE_IMPL = _write_soundfile if sf is not None else _write_wave
+
+
+def write_wav(path: str, data: np.ndarray, fs: int) -> bool:
+    return _WRITE_IMPL(path, data, fs)
@@ -0,0 +1,14 @@
+import numpy as np
+
+from analysis import attack_release
+
+
+def test_first_crossing_matches_mask_search(monkeypatch):
+    env = np.array([0.1, 0.2, 0.9, 0.95, 0.4, 0.05], dtype=np.float32)
+    cases = [(0.5, 'up'), (0.96, 'up'), (0.3, 'down'), (0.06, 'down'), (0.0, 'down')]
+    expected = [2, None, 0, 5, None]
+    assert [attack_release.first_crossing(env, lvl, d) for lvl, d in cases] == expected
+    monkeypatch.setattr(attack_release, "NUMBA_AVAILABLE", False)
+    monkeypatch.setattr(attack_release, "CROSSING_BLOCK", 4)  # crossings in later blocks
+    assert [attack_release.first_crossing(env, lvl, d) for lvl, d in cases] == expected
+    assert attack_release.first_crossing(env[:0], 0.5) is None
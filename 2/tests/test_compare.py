@@ -54,3 +54,45 @@ def test_align_prefers_onset_detection():
     a_ref, a_tgt, lag = compare.align_signals(ref, tgt, prefer_onset=True, max_lag_samples=50)
     assert lag == 12
     assert np.allclose(a_ref, a_tgt)
+
+
+def test_fft_correlation_matches_direct():
+    rng = np.random.default_rng(0)
+    for n_t, n_r in ((100, 37), (5, 9), (1, 1), (257, 256)):
+        tgt, ref = rng.standard_normal(n_t), rng.standard_normal(n_r)
+        assert np.allclose(compare._xcorr_full(tgt, ref), np.correlate(tgt, ref, mode='full'))
+
+
+def test_smooth_abs_matches_convolution():
+    x = np.random.RandomState(3).randn(5000)
+    for win in (256, 255, 7):
+        ref = np.convolve(np.abs(x), np.ones(win) / float(win), mode='same')
+        assert np.allclose(compare._smooth_abs(x, win), ref, atol=1e-6)
+
+
+def test_bounded_lag_correlation_matches_full():
+    rng = np.random.RandomState(4)
+    tgt, ref = rng.rand(700), rng.rand(500)
+    full = np.correlate(tgt, ref, mode='full')
+    center = len(ref) - 1
+    assert np.allclose(compare._xcorr_lags(tgt, ref, -20, 20), full[center - 20 : center + 21])
+
+
+def test_align_signals_returns_views_of_float32_input():
+    ref, tgt = _make_step(12)
+    ref, tgt = ref.astype(np.float32), tgt.astype(np.float32)
+    a_ref, a_tgt, lag = compare.align_signals(ref, tgt, max_lag_samples=50)
+    assert lag == 12
+    assert np.shares_memory(a_ref, ref) and np.shares_memory(a_tgt, tgt)
+    assert a_ref.flags.c_contiguous and a_tgt.dtype == np.float32
+
+
+def test_compare_pair_reports_latency_and_gain():
+    fs = 8000
+    t = np.arange(fs) / fs
+    ref = (0.5 * np.sin(2 * np.pi * 440 * t)).astype(np.float32)
+    ref[:800] = 0.0
+    tgt = np.concatenate([np.zeros(40, dtype=np.float32), 0.5 * ref])
+    metrics = compare.compare_pair(ref, tgt, fs, 440.0, max_lag_samples=200)
+    assert metrics["latency_samples"] == 40
+    assert abs(metrics["gain_error_db"] - 20 * np.log10(0.5)) < 0.1
@@ -0,0 +1,90 @@
+import collections
+import threading
+
+import numpy as np
+
+import GUI_D_3_2_1 as gui
+from audio import wav_io
+from utils.logging import UILogger
+
+
+class _FakeMaster:
+    """Stands in for the Tk root: ``after`` jobs run when ``run_pending`` is called."""
+
+    def __init__(self):
+        self.jobs = collections.deque()
+
+    def after(self, ms, func):
+        self.jobs.append(func)
+        return len(self.jobs)
+
+    def run_pending(self, limit=100):
+        while self.jobs and limit:
+            self.jobs.popleft()()
+            limit -= 1
+
+
+def _bare_app():
+    app = object.__new__(gui.AudioAnalysisToolkitApp)
+    app.master = _FakeMaster()
+    app._ui_calls = collections.deque()
+    app._ui_pump_job = None
+    app._ui_producers = []
+    app._tk_thread = threading.current_thread()
+    return app
+
+
+def test_log_from_unwatched_thread_is_flushed():
+    app = _bare_app()
+    out = []
+    app.logger = UILogger(out.append, schedule=app._schedule_log_flush)
+    worker = threading.Thread(target=app.hw_log, args=("from worker",))
+    worker.start()
+    worker.join()
+    app.master.run_pending()
+    assert out == ["from worker"]
+    app.hw_log("from tk")  # the logger must not be stuck waiting on a flush
+    app.master.run_pending()
+    assert out == ["from worker", "from tk"]
+
+
+def test_plot_manager_is_resolved_on_tk_thread_only():
+    app = _bare_app()
+    app.logger = UILogger(lambda line: None, schedule=app._schedule_log_flush)
+    app._plot_manager = None
+    app._plot_lock = threading.Lock()
+    app._pending_plots = {}
+    calls = []
+
+    class _Manager:
+        def open_thd_snapshot(self, *args):
+            calls.append((threading.current_thread(), args))
+
+    def worker():
+        app._schedule_plot("open_thd_snapshot", 1)
+        app._schedule_plot("open_thd_snapshot", 2)  # coalesced: newest wins
+
+    t = threading.Thread(target=worker)
+    t.start()
+    t.join()
+    assert app._plot_manager is None
+    app._plot_manager = _Manager()
+    app.master.run_pending()
+    assert calls == [(threading.current_thread(), (2,))]
+
+
+def test_wav_cache_does_not_hold_file_mappings(tmp_path, monkeypatch):
+    app = _bare_app()
+    app._wav_cache = {}
+    app._wav_cache_lock = threading.Lock()
+    sig = np.linspace(-0.5, 0.5, 256, dtype=np.float32)
+    path = str(tmp_path / "float.raw")
+    sig.tofile(path)
+    mapped = lambda p: (48000, np.memmap(p, dtype=np.float32, mode="c"))
+    monkeypatch.setattr(wav_io, "read_wav", mapped)
+
+    fs, data, _ = app._read_wav_cached(path)
+    assert fs == 48000
+    assert not isinstance(data, np.memmap)
+    assert not data.flags.writeable
+    assert np.array_equal(data, sig)
@@ -0,0 +1,90 @@
+import numpy as np
+
+from analysis import live_measurements
+from audio import wav_io
+
+
+def test_recording_stats_matches_numpy():
+    x = np.array([0.1, -0.5, 1.0, -1.2, 0.25], dtype=np.float32)
+    st = live_measurements.recording_stats(x)
+    assert st["min"] == np.float32(-1.2)
+    assert st["max"] == 1.0
+    assert np.isclose(st["rms"], np.sqrt(np.mean(np.square(x))), rtol=1e-6)
+    assert st["clips"] == 2
+
+
+def test_async_csv_rows_are_appended_in_order(tmp_path):
+    for i in range(3):
+        path = live_measurements.append_csv_row_async(("row", str(i)), str(tmp_path))
+    live_measurements.flush_csv_writes()
+    with open(path, encoding="utf-8") as f:
+        assert f.read().splitlines() == ["row,0", "row,1", "row,2"]
+
+
+
+def test_async_csv_writer_survives_bad_row_and_failing_log(tmp_path):
+    def broken_log(msg):
+        raise RuntimeError("log sink gone")
+
+    live_measurements.append_csv_row_async(("bad", "\ud800"), str(tmp_path), log=broken_log)
+    path = live_measurements.append_csv_row_async(("ok", "1"), str(tmp_path))
+    live_measurements.flush_csv_writes()  # must not hang
+    with open(path, encoding="utf-8") as f:
+        assert f.read().splitlines() == ["ok,1"]
+
+def test_goertzel_harmonics_match_fft_path():
+    fs, n = 48000, 8192
+    t = np.arange(n) / fs
+    x = (np.sin(2 * np.pi * 1000 * t) + 0.01 * np.sin(2 * np.pi * 3000 * t)).astype(np.float32)
+    ref = live_measurements._harmonic_metrics(x, fs, 1000.0, 5)
+    fast = live_measurements._harmonic_metrics_goertzel(x, fs, 1000.0, 5)
+    assert np.isclose(fast[1], ref[1], rtol=1e-6)
+    for h in ref[0]:
+        assert np.isclose(fast[0][h], ref[0][h], atol=1e-6)
+
+
+def test_thd_tone_matches_numpy_reference():
+    fs, freq, amp = 8000, 997.0, 0.7
+    t = np.linspace(0, 0.5, int(fs * 0.5), endpoint=False)
+    ref = amp * np.sin(2 * np.pi * freq * t)
+    tone = live_measurements.generate_thd_tone(freq, amp, fs, duration=0.5)
+    assert tone.dtype == np.float32 and tone.shape == (len(t), 2)
+    assert np.allclose(tone[:, 0], ref, atol=1e-6)
+    assert not tone[:, 1].any()
+
+
+def test_compressor_capture_segment_rms_matches_loop():
+    tone = live_measurements.generate_compressor_tone(1000.0, 8000)
+    tx, meta = tone["signal"], tone["meta"]
+    seg_n, gap_n = meta["seg_samples"], meta["gap_samples"]
+    lead, tail = meta.get("trim_lead", int(0.03 * 8000)), meta.get("trim_tail", int(0.01 * 8000))
+    # the full capture, then one cut mid-segment so the last tones are partial
+    for rx in (tx, tx[: 10 * (seg_n + gap_n) + seg_n // 2]):
+        res = live_measurements.analyze_compressor_capture(rx[:, None], meta, 8000)
+        expected = []
+        for idx in range(len(meta["amps"])):
+            seg = rx[idx * (seg_n + gap_n) : idx * (seg_n + gap_n) + seg_n]
+            seg = seg[lead : max(lead, len(seg) - tail)]
+            rms = np.sqrt(np.mean(np.square(seg, dtype=np.float64))) if len(seg) else 0.0
+            expected.append(20 * np.log10(max(rms, 1e-12)))
+        assert np.allclose(res["out_db"], expected, atol=1e-6)
+
+
+def test_compressor_tone_is_cached_read_only():
+    first = live_measurements.generate_compressor_tone(1000.0, 8000)
+    second = live_measurements.generate_compressor_tone(1000.0, 8000)
+    assert first["signal"] is second["signal"]
+    assert not first["signal"].flags.writeable
+    first["meta"]["seg_samples"] = 0
+    assert second["meta"]["seg_samples"] == 2000
+
+
+def test_async_artifacts_snapshot_reused_buffers(tmp_path):
+    tx = np.linspace(-0.5, 0.5, 480, dtype=np.float32)
+    rx = tx.copy()
+    paths = live_measurements.save_artifacts_async("t", tx, rx, 48000, str(tmp_path))
+    rx[:] = 0.0  # the capture buffer is reused right away
+    live_measurements.flush_wav_writes()
+    fs, data = wav_io.read_wav(paths["rx"])
+    assert fs == 48000
+    assert np.allclose(data, tx, atol=1e-4)
@@ -0,0 +1,27 @@
+from utils.logging import UILogger
+
+
+def test_batches_until_flush():
+    out, jobs = [], []
+    logger = UILogger(out.append, schedule=jobs.append)
+    logger.log("a")
+    logger.log("b")
+    assert out == [] and len(jobs) == 1
+    jobs.pop()()
+    assert out == ["a\nb"]
+
+
+def test_bounded_queue_drops_oldest():
+    out, jobs = [], []
+    logger = UILogger(out.append, schedule=jobs.append, maxlen=2)
+    for msg in "abcd":
+        logger.log(msg)
+    jobs.pop()()
+    assert out == ["[WARN] 2 log lines dropped\nc\nd"]
+
+
+def test_without_callback_nothing_is_queued():
+    jobs = []
+    logger = UILogger(None, schedule=jobs.append)
+    logger.info("a")
+    assert jobs == [] and not logger._pending
@@ -0,0 +1,13 @@
+import threading
+
+from utils.threading import run_in_thread
+
+
+def test_run_in_thread_passes_args_on_shared_pool():
+    stop = threading.Event()
+    stop.set()
+    names = []
+    future = run_in_thread(lambda a, b=0: names.append(threading.current_thread().name) or a + b, stop, "job", 2, b=3)
+    assert future.result(timeout=5) == 5
+    assert future.name == "job" and not stop.is_set()
+    assert names[0].startswith("g2_bg")
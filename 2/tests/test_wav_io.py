@@ -0,0 +1,114 @@
+import builtins
+import struct
+import wave
+
+import numpy as np
+import pytest
+
+from audio import wav_io
+
+
+def _write_float32_wav(path, data: np.ndarray, fs: int):
+    payload = data.astype('<f4').tobytes()
+    channels = 1 if data.ndim == 1 else data.shape[1]
+    fmt = struct.pack('<HHIIHH', 3, channels, fs, fs * channels * 4, channels * 4, 32)
+    with open(path, 'wb') as f:
+        f.write(b'RIFF' + struct.pack('<I', 4 + 8 + len(fmt) + 8 + len(payload)) + b'WAVE')
+        f.write(b'fmt ' + struct.pack('<I', len(fmt)) + fmt)
+        f.write(b'data' + struct.pack('<I', len(payload)) + payload)
+
+
+def test_read_wav_int16_matches_wave_decode(tmp_path):
+    sig = np.random.RandomState(0).uniform(-1, 1, size=(500, 2)).astype(np.float32)
+    path = str(tmp_path / "pcm16.wav")
+    assert wav_io.write_wav(path, sig, 44100)
+
+    fs, data = wav_io.read_wav(path)
+    with wave.open(path, 'rb') as wf:
+        ref = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
+    assert fs == 44100
+    assert data.dtype == np.float32
+    assert np.array_equal(data, ref.reshape(-1, 2))
+
+
+def test_read_wav_float32_is_mapped_copy_on_write(tmp_path):
+    sig = np.linspace(-0.5, 0.5, 256, dtype=np.float32)
+    path = str(tmp_path / "float.wav")
+    _write_float32_wav(path, sig, 48000)
+
+    fs, data = wav_io.read_wav(path)
+    assert fs == 48000
+    assert isinstance(data, np.memmap)
+    assert np.array_equal(data, sig)
+    data[0] = 1.0  # private copy-on-write mapping must not touch the file
+    assert wav_io.read_wav(path)[1][0] == sig[0]
+
+
+def test_streamed_write_matches_single_pass_conversion(tmp_path, monkeypatch):
+    monkeypatch.setattr(wav_io, "WRITE_BLOCK_FRAMES", 100)
+    sig = np.random.RandomState(1).uniform(-1.2, 1.2, size=(1050, 2)).astype(np.float32)
+    path = str(tmp_path / "streamed.wav")
+    assert wav_io.write_wav(path, sig, 48000)
+
+    with wave.open(path, 'rb') as wf:
+        assert wf.getnframes() == len(sig)
+        pcm = np.frombuffer(wf.readframes(wf.getnframes()), dtype='<i2')
+    assert np.array_equal(pcm, (np.clip(sig, -1.0, 1.0) * 32767).astype('<i2').ravel())
+
+
+def test_wave_fallback_decodes_in_blocks(tmp_path, monkeypatch):
+    sig = np.random.RandomState(2).uniform(-1, 1, size=(1001, 2)).astype(np.float32)
+    path = str(tmp_path / "blocks.wav")
+    assert wav_io.write_wav(path, sig, 48000)
+    monkeypatch.setattr(wav_io, "_read_wav_memmap", lambda p: (None, None))
+    monkeypatch.setattr(wav_io, "READ_BLOCK_BYTES", 400)
+
+    fs, data = wav_io.read_wav(path)
+    with wave.open(path, 'rb') as wf:
+        ref = np.frombuffer(wf.readframes(wf.getnframes()), dtype=np.int16).astype(np.float32) / 32768.0
+    assert fs == 48000
+    assert np.array_equal(data, ref.reshape(-1, 2))
+
+
+def test_multichannel_reads_are_planar(tmp_path, monkeypatch):
+    sig = np.random.RandomState(3).uniform(-1, 1, size=(300, 2)).astype(np.float32)
+    pcm_path, float_path = str(tmp_path / "pcm.wav"), str(tmp_path / "float.wav")
+    assert wav_io.write_wav(pcm_path, sig, 48000)
+    _write_float32_wav(float_path, sig, 48000)
+
+    mapped = wav_io.read_wav(pcm_path)[1]
+    monkeypatch.setattr(wav_io, "_read_wav_memmap", lambda p: (None, None))
+    decoded = wav_io.read_wav(pcm_path)[1]
+    monkeypatch.undo()
+    floats = wav_io.read_wav(float_path)[1]
+    for data in (mapped, decoded, floats):
+        assert data.shape == (300, 2) and data[:, 1].flags.c_contiguous
+    assert np.array_equal(mapped, decoded)
+    assert np.array_equal(floats, sig)
+
+
+def test_missing_file_skips_fallback_backend(tmp_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(wav_io, "_READ_IMPL", lambda p: calls.append(p) or (None, None))
+    assert wav_io.read_wav(str(tmp_path / "missing.wav")) == (None, None)
+    assert calls == []
+
+
+def test_wav_writer_closes_file_when_header_setup_fails(tmp_path, monkeypatch):
+    opened = []
+    real_open = builtins.open
+
+    def tracking_open(*args, **kwargs):
+        f = real_open(*args, **kwargs)
+        opened.append(f)
+        return f
+
+    monkeypatch.setattr(builtins, "open", tracking_open)
+    try:
+        wav_io.WavWriter(str(tmp_path / "bad.wav"), 48000, channels=0)
+    except wave.Error:
+        # the live traceback keeps the half-built writer referenced, so
+        # this checks an explicit close rather than garbage collection
+        assert opened and all(f.closed for f in opened)
+    else:
+        pytest.fail("channels=0 should be rejected")
@@ -0,0 +1,39 @@
+"""Ahead-of-time compile the Numba DSP kernels into ``analysis/g2_dsp``.
+
+The resulting extension is picked up by ``analysis.jit.prefer_aot`` so the GUI
+does not pay JIT compile/cache-load time on a fresh start. Requires Numba and
+a C compiler; rerun after changing any exported kernel.
+"""
+
+import os
+import sys
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.abspath(os.path.join(BASE_DIR, os.pardir)))
+
+from analysis import compressor, jit, thd
+
+# exported name -> (jit dispatcher, signature)
+KERNELS = {
+    "envelope_kernel": (compressor._envelope_kernel, "f4[::1](f8[::1], f8, f8)"),
+    "harmonic_band_power": (thd._harmonic_band_power, "f8[::1](f8[::1], i8[::1], i8)"),
+}
+
+
+def main() -> int:
+    if jit.numba is None:
+        print(f"Numba không khả dụng: {jit._numba_error}")
+        return 1
+    from numba.pycc import CC
+
+    cc = CC(jit.AOT_MODULE)
+    cc.output_dir = os.path.abspath(os.path.join(BASE_DIR, os.pardir, "analysis"))
+    for name, (kernel, signature) in KERNELS.items():
+        cc.export(name, signature)(kernel.py_func)
+    cc.compile()
+    print(f"Đã build {jit.AOT_MODULE} vào {cc.output_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
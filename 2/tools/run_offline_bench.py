@@ -1,11 +1,14 @@
 import argparse
 import csv
+import concurrent.futures
+import functools
 import json
+import math
 import os
 import platform
 import sys
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 import numpy as np
 
@@ -13,8 +16,12 @@ BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 sys.path.append(os.path.abspath(os.path.join(BASE_DIR, os.pardir)))
 
 from analysis import attack_release, compare, compressor, thd
+from analysis.jit import NUMBA_AVAILABLE, njit
 from audio import wav_io
 
+OUTPUT_BUFFER_BYTES = 1 << 20  # result files are flushed in 1 MB writes
+_DSP_DEBUG = bool(os.getenv("DSP_DEBUG"))  # read once; _log runs per case
+
 
 @dataclass
 class BenchConfig:
@@ -55,39 +62,137 @@ class BenchCase:
 # ---------------------------------------------------------------------------
 
 def _log(msg: str, verbose: bool = False) -> None:
-    if verbose or os.getenv("DSP_DEBUG"):
+    if verbose or _DSP_DEBUG:
         print(msg)
 
 
+CaseRunner = Callable[[BenchConfig, Dict[str, Any], bool], BenchCase]
+
+
+def _run_tasks(
+    tasks: List[Tuple[CaseRunner, Dict[str, Any]]],
+    cfg: BenchConfig,
+    verbose: bool,
+    jobs: int,
+    processes: bool = False,
+) -> List[BenchCase]:
+    """Run every ``(runner, entry)`` task on ``jobs`` workers, keeping task order.
+
+    Threads by default: the heavy parts (FFT, BLAS, WAV decode, nogil kernels)
+    release the GIL and the WAV cache stays shared. ``processes`` switches to a
+    process pool for GIL-bound workloads; each worker then decodes on its own.
+    """
+    if jobs <= 1 or len(tasks) <= 1:
+        return [run_case(cfg, entry, verbose) for run_case, entry in tasks]
+    pool_cls = concurrent.futures.ProcessPoolExecutor if processes else concurrent.futures.ThreadPoolExecutor
+    with pool_cls(max_workers=min(jobs, len(tasks))) as pool:
+        futures = [pool.submit(run_case, cfg, entry, verbose) for run_case, entry in tasks]
+        return [future.result() for future in futures]
+
+
+def _map_cases(
+    run_case: CaseRunner,
+    cfg: BenchConfig,
+    cases_cfg: List[Dict[str, Any]],
+    verbose: bool,
+    jobs: int,
+) -> List[BenchCase]:
+    return _run_tasks([(run_case, entry) for entry in cases_cfg], cfg, verbose, jobs)
+
+
+@functools.lru_cache(maxsize=32)
+def _read_wav_keyed(path: str, mtime_ns: int, size: int):
+    fs, data = wav_io.read_wav(path)
+    if data is not None:
+        if isinstance(data, np.memmap):
+            data = np.array(data)  # don't pin the file mapping in the cache
+        data.setflags(write=False)  # shared between cases
+    return fs, data
+
+
+def _read_wav_cached(path: str):
+    """``wav_io.read_wav`` decoded once per file version across all cases."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None, None
+    return _read_wav_keyed(path, st.st_mtime_ns, st.st_size)
+
+
 def _load_config(path: str) -> Dict[str, Any]:
     with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
+@njit(cache=True, fastmath=True, nogil=True)
+def _sine_kernel(n: int, amp: float, omega: float, order: float, harm_amp: float) -> np.ndarray:
+    out = np.empty(n, dtype=np.float32)
+    for i in range(n):
+        phase = omega * i
+        acc = amp * np.sin(phase)
+        if harm_amp != 0.0:
+            acc += harm_amp * np.sin(phase * order)
+        out[i] = acc
+    return out
+
+
 def _sine_with_harmonic(freq: float, fs: int, duration: float, amp: float, harmonic: Optional[Dict[str, Any]] = None) -> np.ndarray:
-    t = np.linspace(0, duration, int(fs * duration), endpoint=False)
-    sig = amp * np.sin(2 * np.pi * freq * t)
+    n = int(fs * duration)
+    # An integer tone on a whole-sample grid repeats every fs / gcd(fs, freq)
+    # samples (48 for 1 kHz at 48 kHz); synthesize one period and tile it.
+    period = n
+    if float(freq).is_integer() and n == fs * duration:
+        period = min(n, fs // math.gcd(int(fs), int(freq)))
+    omega = 2 * np.pi * freq * duration / max(n, 1)
+    order, harm_amp = 1, 0.0
     if harmonic:
         order = int(harmonic.get("order", 2))
         level_db = float(harmonic.get("level_db", -30.0))
         harm_amp = amp * 10 ** (level_db / 20.0)
-        sig += harm_amp * np.sin(2 * np.pi * freq * order * t)
-    return sig.astype(np.float32)
+    if NUMBA_AVAILABLE and period > 0:
+        # one pass straight into the float32 buffer, no phase/sine temporaries
+        sig = _sine_kernel(period, float(amp), omega, float(order), harm_amp)
+    else:
+        # float64 phase (float32 drifts enough to show up in THD), evaluated in
+        # place: one phase buffer, one accumulator, one final float32 cast
+        phase = np.arange(period) * omega
+        sig = np.sin(phase)
+        sig *= amp
+        if harm_amp:
+            phase *= order
+            np.sin(phase, out=phase)
+            phase *= harm_amp
+            sig += phase
+        sig = sig.astype(np.float32)
+    return sig if period == n else np.resize(sig, n)
+
+
+def _json_default(obj: Any) -> Any:
+    """``json`` fallback for NumPy values; everything else is encoded natively."""
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+# One compact encoder for every nested CSV cell; json.dumps(default=...) would
+# build a fresh encoder per call.
+_CELL_ENCODER = json.JSONEncoder(default=_json_default)
 
 
 def _flatten_metrics(case: BenchCase) -> Dict[str, Any]:
     row: Dict[str, Any] = {"name": case.name, "category": case.category}
+    encode = _CELL_ENCODER.encode
     for key, val in case.metrics.items():
-        if isinstance(val, (list, tuple, np.ndarray)):
-            row[key] = json.dumps(val if not isinstance(val, np.ndarray) else val.tolist())
-        elif isinstance(val, dict):
-            row[key] = json.dumps(val)
+        if isinstance(val, (list, tuple, dict, np.ndarray)):
+            row[key] = encode(val)
         else:
             row[key] = val
     if case.notes:
         row["notes"] = " | ".join(case.notes)
     if case.params:
-        row["params"] = json.dumps(case.params)
+        row["params"] = encode(case.params)
     return row
 
 
@@ -99,162 +204,148 @@ def _collect_env() -> Dict[str, str]:
     }
 
 
-def _to_jsonable(obj: Any) -> Any:
-    if isinstance(obj, np.ndarray):
-        return obj.tolist()
-    if isinstance(obj, (np.floating, np.integer)):
-        return obj.item()
-    if isinstance(obj, (np.bool_,)):
-        return bool(obj)
-    if isinstance(obj, dict):
-        return {k: _to_jsonable(v) for k, v in obj.items()}
-    if isinstance(obj, (list, tuple)):
-        return [_to_jsonable(v) for v in obj]
-    return obj
-
-
 # ---------------------------------------------------------------------------
 # Bench runners
 # ---------------------------------------------------------------------------
 
-def run_thd_cases(cfg: BenchConfig, cases_cfg: List[Dict[str, Any]], verbose: bool) -> List[BenchCase]:
-    results: List[BenchCase] = []
-    for entry in cases_cfg:
-        name = entry.get("name", "thd_case")
-        params = {
-            "freq": entry.get("freq", cfg.freq),
-            "amp": entry.get("amp", cfg.amp),
-            "duration": entry.get("duration", cfg.duration),
-            "max_h": entry.get("max_h", cfg.thd_max_h),
-            "window": entry.get("window", cfg.thd_window),
-            "fundamental_band_bins": entry.get("fundamental_band_bins", cfg.thd_fund_band_bins),
-            "nfft": entry.get("nfft", cfg.thd_nfft),
-        }
-
-        if entry.get("type") == "file":
-            wav_path = entry.get("input_wav") or ""
-            if not wav_path or not os.path.isfile(wav_path):
-                results.append(BenchCase(name=name, category="thd", params=params, notes=["Skipped: missing input_wav."]))
-                continue
-            fs, data = wav_io.read_wav(wav_path)
-            if fs is None:
-                results.append(BenchCase(name=name, category="thd", params=params, notes=["Skipped: cannot read WAV."]))
-                continue
-            signal = data
-        else:
-            signal = _sine_with_harmonic(
-                params["freq"], cfg.fs, params["duration"], params["amp"], harmonic=entry.get("harmonic")
-            )
-            fs = cfg.fs
-
-        _log(f"[THD] Running {name} (fs={fs}, freq={params['freq']})", verbose)
-        metrics = thd.compute_thd(
-            signal,
-            fs,
-            params["freq"],
-            max_h=params["max_h"],
-            window=params["window"],
-            fundamental_band_bins=params["fundamental_band_bins"],
-            nfft=params["nfft"],
-        )
-        notes: List[str] = []
-        if entry.get("expected"):
-            exp = entry["expected"]
-            if "thdn_db_max" in exp and metrics["thdn_db"] > exp["thdn_db_max"]:
-                notes.append(f"Sanity: THD+N {metrics['thdn_db']:.2f} dB exceeds expected max {exp['thdn_db_max']}")
-            if "thd_db_min" in exp and metrics["thd_db"] < exp["thd_db_min"]:
-                notes.append(f"Sanity: THD {metrics['thd_db']:.2f} dB below expected min {exp['thd_db_min']}")
-        results.append(BenchCase(name=name, category="thd", params=params, metrics=metrics, notes=notes))
-    return results
-
-
-def run_attack_release_cases(cfg: BenchConfig, cases_cfg: List[Dict[str, Any]], verbose: bool) -> List[BenchCase]:
-    results: List[BenchCase] = []
-    for entry in cases_cfg:
-        name = entry.get("name", "attack_release")
-        freq = entry.get("freq", cfg.freq)
-        amp = entry.get("amp", cfg.amp)
-        win_ms = entry.get("rms_win_ms", cfg.attack_rms_win_ms)
-        duration = entry.get("duration", cfg.duration)
-
-        tone = attack_release.generate_step_tone(freq, cfg.fs, amp=amp, duration=duration)
-        metrics = attack_release.attack_release_times(tone, cfg.fs, win_ms)
-        params = {"freq": freq, "amp": amp, "rms_win_ms": win_ms, "fs": cfg.fs, "duration": duration}
-        results.append(BenchCase(name=name, category="attack_release", params=params, metrics=metrics))
-        _log(f"[AR] {name}: attack={metrics['attack_ms']:.1f} ms, release={metrics['release_ms']:.1f} ms", verbose)
-    return results
-
-
-def run_compressor_cases(cfg: BenchConfig, cases_cfg: List[Dict[str, Any]], verbose: bool) -> List[BenchCase]:
-    results: List[BenchCase] = []
-    for entry in cases_cfg:
-        name = entry.get("name", "compressor")
-        freq = entry.get("freq", cfg.freq)
-        amp_max = entry.get("amp_max", cfg.compressor_amp_max)
-        apply = bool(entry.get("apply_compressor", False))
-        comp_params = {
-            "threshold_db": entry.get("threshold_db", cfg.compressor_threshold_db),
-            "ratio": entry.get("ratio", cfg.compressor_ratio),
-            "makeup_db": entry.get("makeup_db", cfg.compressor_makeup_db),
-            "knee_db": entry.get("knee_db", cfg.compressor_knee_db),
-            "attack_ms": entry.get("attack_ms", cfg.compressor_attack_ms),
-            "release_ms": entry.get("release_ms", cfg.compressor_release_ms),
-        }
-
-        tone_meta = compressor.build_stepped_tone(freq, cfg.fs, amp_max=amp_max)
-        tx = tone_meta["signal"]
-        rx = tx
-        if apply:
-            rx = compressor.apply_compressor(
-                tx,
-                threshold_db=comp_params["threshold_db"],
-                ratio=comp_params["ratio"],
-                makeup_db=comp_params["makeup_db"],
-                knee_db=comp_params["knee_db"],
-                attack_ms=comp_params["attack_ms"],
-                release_ms=comp_params["release_ms"],
-                fs=cfg.fs,
-            )
-
-        metrics = compressor.compression_curve(rx, tone_meta["meta"], cfg.fs, freq)
-        params = {"freq": freq, "amp_max": amp_max, **comp_params, "applied": apply, "fs": cfg.fs}
-        results.append(BenchCase(name=name, category="compressor", params=params, metrics=metrics))
-        _log(
-            f"[COMP] {name}: thr={metrics['thr_db']}, ratio={metrics['ratio']}, gain_off={metrics['gain_offset_db']:+.2f} dB",
-            verbose,
+def _thd_case(cfg: BenchConfig, entry: Dict[str, Any], verbose: bool) -> BenchCase:
+    name = entry.get("name", "thd_case")
+    params = {
+        "freq": entry.get("freq", cfg.freq),
+        "amp": entry.get("amp", cfg.amp),
+        "duration": entry.get("duration", cfg.duration),
+        "max_h": entry.get("max_h", cfg.thd_max_h),
+        "window": entry.get("window", cfg.thd_window),
+        "fundamental_band_bins": entry.get("fundamental_band_bins", cfg.thd_fund_band_bins),
+        "nfft": entry.get("nfft", cfg.thd_nfft),
+    }
+
+    if entry.get("type") == "file":
+        wav_path = entry.get("input_wav") or ""
+        if not wav_path or not os.path.isfile(wav_path):
+            return BenchCase(name=name, category="thd", params=params, notes=["Skipped: missing input_wav."])
+        fs, data = _read_wav_cached(wav_path)
+        if fs is None:
+            return BenchCase(name=name, category="thd", params=params, notes=["Skipped: cannot read WAV."])
+        signal = data
+    else:
+        signal = _sine_with_harmonic(
+            params["freq"], cfg.fs, params["duration"], params["amp"], harmonic=entry.get("harmonic")
         )
-    return results
-
-
-def run_compare_cases(cfg: BenchConfig, cases_cfg: List[Dict[str, Any]], verbose: bool) -> List[BenchCase]:
-    results: List[BenchCase] = []
-    for entry in cases_cfg:
-        name = entry.get("name", "compare")
-        inp = entry.get("input_wav") or ""
-        out = entry.get("output_wav") or ""
-        freq = entry.get("freq", cfg.freq)
-        hmax = entry.get("hmax", cfg.thd_max_h)
-        if not (inp and out and os.path.isfile(inp) and os.path.isfile(out)):
-            results.append(BenchCase(name=name, category="compare", params={"input": inp, "output": out}, notes=["Skipped: missing input/output wav."]))
-            continue
-
-        fs_in, sig_in = wav_io.read_wav(inp)
-        fs_out, sig_out = wav_io.read_wav(out)
-        if fs_in is None or fs_out is None or fs_in != fs_out:
-            results.append(BenchCase(name=name, category="compare", params={"input": inp, "output": out}, notes=["Skipped: fs mismatch or read error."]))
-            continue
-
-        aligned_ref, aligned_tgt, lag = compare.align_signals(sig_in, sig_out)
-        gain_matched, gain_error_db = compare.gain_match(aligned_ref, aligned_tgt)
-        metrics = compare.residual_metrics(aligned_ref, gain_matched, fs_in, freq, hmax)
-        metrics.update({"latency_samples": lag, "latency_ms": lag / fs_in * 1000.0, "gain_error_db": gain_error_db})
-        params = {"freq": freq, "fs": fs_in, "hmax": hmax, "input_wav": inp, "output_wav": out}
-        results.append(BenchCase(name=name, category="compare", params=params, metrics=metrics))
-        _log(
-            f"[CMP] {name}: latency={metrics['latency_ms']:.2f} ms, gain_err={metrics['gain_error_db']:+.2f} dB, SNR={metrics['snr_db']:.2f} dB",
-            verbose,
+        fs = cfg.fs
+
+    _log(f"[THD] Running {name} (fs={fs}, freq={params['freq']})", verbose)
+    metrics = thd.compute_thd(
+        signal,
+        fs,
+        params["freq"],
+        max_h=params["max_h"],
+        window=params["window"],
+        fundamental_band_bins=params["fundamental_band_bins"],
+        nfft=params["nfft"],
+    )
+    notes: List[str] = []
+    if entry.get("expected"):
+        exp = entry["expected"]
+        if "thdn_db_max" in exp and metrics["thdn_db"] > exp["thdn_db_max"]:
+            notes.append(f"Sanity: THD+N {metrics['thdn_db']:.2f} dB exceeds expected max {exp['thdn_db_max']}")
+        if "thd_db_min" in exp and metrics["thd_db"] < exp["thd_db_min"]:
+            notes.append(f"Sanity: THD {metrics['thd_db']:.2f} dB below expected min {exp['thd_db_min']}")
+    return BenchCase(name=name, category="thd", params=params, metrics=metrics, notes=notes)
+
+
+def run_thd_cases(cfg: BenchConfig, cases_cfg: List[Dict[str, Any]], verbose: bool, jobs: int = 1) -> List[BenchCase]:
+    return _map_cases(_thd_case, cfg, cases_cfg, verbose, jobs)
+
+
+def _attack_release_case(cfg: BenchConfig, entry: Dict[str, Any], verbose: bool) -> BenchCase:
+    name = entry.get("name", "attack_release")
+    freq = entry.get("freq", cfg.freq)
+    amp = entry.get("amp", cfg.amp)
+    win_ms = entry.get("rms_win_ms", cfg.attack_rms_win_ms)
+    duration = entry.get("duration", cfg.duration)
+
+    tone = attack_release.generate_step_tone(freq, cfg.fs, amp=amp, duration=duration)
+    metrics = attack_release.attack_release_times(tone, cfg.fs, win_ms)
+    params = {"freq": freq, "amp": amp, "rms_win_ms": win_ms, "fs": cfg.fs, "duration": duration}
+    case = BenchCase(name=name, category="attack_release", params=params, metrics=metrics)
+    _log(f"[AR] {name}: attack={metrics['attack_ms']:.1f} ms, release={metrics['release_ms']:.1f} ms", verbose)
+    return case
+
+
+def run_attack_release_cases(cfg: BenchConfig, cases_cfg: List[Dict[str, Any]], verbose: bool, jobs: int = 1) -> List[BenchCase]:
+    return _map_cases(_attack_release_case, cfg, cases_cfg, verbose, jobs)
+
+
+def _compressor_case(cfg: BenchConfig, entry: Dict[str, Any], verbose: bool) -> BenchCase:
+    name = entry.get("name", "compressor")
+    freq = entry.get("freq", cfg.freq)
+    amp_max = entry.get("amp_max", cfg.compressor_amp_max)
+    apply = bool(entry.get("apply_compressor", False))
+    comp_params = {
+        "threshold_db": entry.get("threshold_db", cfg.compressor_threshold_db),
+        "ratio": entry.get("ratio", cfg.compressor_ratio),
+        "makeup_db": entry.get("makeup_db", cfg.compressor_makeup_db),
+        "knee_db": entry.get("knee_db", cfg.compressor_knee_db),
+        "attack_ms": entry.get("attack_ms", cfg.compressor_attack_ms),
+        "release_ms": entry.get("release_ms", cfg.compressor_release_ms),
+    }
+
+    tone_meta = compressor.build_stepped_tone(freq, cfg.fs, amp_max=amp_max)
+    tx = tone_meta["signal"]
+    rx = tx
+    if apply:
+        rx = compressor.apply_compressor(
+            tx,
+            threshold_db=comp_params["threshold_db"],
+            ratio=comp_params["ratio"],
+            makeup_db=comp_params["makeup_db"],
+            knee_db=comp_params["knee_db"],
+            attack_ms=comp_params["attack_ms"],
+            release_ms=comp_params["release_ms"],
+            fs=cfg.fs,
         )
-    return results
+
+    metrics = compressor.compression_curve(rx, tone_meta["meta"], cfg.fs, freq)
+    params = {"freq": freq, "amp_max": amp_max, **comp_params, "applied": apply, "fs": cfg.fs}
+    case = BenchCase(name=name, category="compressor", params=params, metrics=metrics)
+    _log(
+        f"[COMP] {name}: thr={metrics['thr_db']}, ratio={metrics['ratio']}, gain_off={metrics['gain_offset_db']:+.2f} dB",
+        verbose,
+    )
+    return case
+
+
+def run_compressor_cases(cfg: BenchConfig, cases_cfg: List[Dict[str, Any]], verbose: bool, jobs: int = 1) -> List[BenchCase]:
+    return _map_cases(_compressor_case, cfg, cases_cfg, verbose, jobs)
+
+
+def _compare_case(cfg: BenchConfig, entry: Dict[str, Any], verbose: bool) -> BenchCase:
+    name = entry.get("name", "compare")
+    inp = entry.get("input_wav") or ""
+    out = entry.get("output_wav") or ""
+    freq = entry.get("freq", cfg.freq)
+    hmax = entry.get("hmax", cfg.thd_max_h)
+    if not (inp and out and os.path.isfile(inp) and os.path.isfile(out)):
+        return BenchCase(name=name, category="compare", params={"input": inp, "output": out}, notes=["Skipped: missing input/output wav."])
+
+    fs_in, sig_in = _read_wav_cached(inp)
+    fs_out, sig_out = _read_wav_cached(out)
+    if fs_in is None or fs_out is None or fs_in != fs_out:
+        return BenchCase(name=name, category="compare", params={"input": inp, "output": out}, notes=["Skipped: fs mismatch or read error."])
+
+    metrics = compare.compare_pair(sig_in, sig_out, fs_in, freq, hmax)
+    params = {"freq": freq, "fs": fs_in, "hmax": hmax, "input_wav": inp, "output_wav": out}
+    case = BenchCase(name=name, category="compare", params=params, metrics=metrics)
+    _log(
+        f"[CMP] {name}: latency={metrics['latency_ms']:.2f} ms, gain_err={metrics['gain_error_db']:+.2f} dB, SNR={metrics['snr_db']:.2f} dB",
+        verbose,
+    )
+    return case
+
+
+def run_compare_cases(cfg: BenchConfig, cases_cfg: List[Dict[str, Any]], verbose: bool, jobs: int = 1) -> List[BenchCase]:
+    return _map_cases(_compare_case, cfg, cases_cfg, verbose, jobs)
 
 
 # ---------------------------------------------------------------------------
@@ -271,27 +362,27 @@ def write_outputs(cases: List[BenchCase], json_path: str, csv_path: str) -> None
             {
                 "name": case.name,
                 "category": case.category,
-                "params": _to_jsonable(case.params),
-                "metrics": _to_jsonable(case.metrics),
+                "params": case.params,
+                "metrics": case.metrics,
                 "notes": case.notes,
             }
         )
 
     data = {"env": _collect_env(), "cases": serializable_cases}
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    # Encode in one go and hand the text over in a single write; json.dump
+    # would push thousands of small indent/item chunks through the file.
+    with open(json_path, "w", encoding="utf-8", buffering=OUTPUT_BUFFER_BYTES) as f:
+        f.write(json.dumps(data, ensure_ascii=False, indent=2, default=_json_default))
 
     all_rows = [_flatten_metrics(c) for c in cases]
-    fieldnames: List[str] = []
-    for row in all_rows:
-        for key in row.keys():
-            if key not in fieldnames:
-                fieldnames.append(key)
+    # first-seen column order; dict keys dedupe without rescanning a list
+    fieldnames: List[str] = list(dict.fromkeys(key for row in all_rows for key in row))
+    table = [[row.get(key, "") for key in fieldnames] for row in all_rows]
 
-    with open(csv_path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        writer.writerows(all_rows)
+    with open(csv_path, "w", newline="", encoding="utf-8", buffering=OUTPUT_BUFFER_BYTES) as f:
+        writer = csv.writer(f)
+        writer.writerow(fieldnames)
+        writer.writerows(table)
 
 
 # ---------------------------------------------------------------------------
@@ -304,6 +395,17 @@ def main() -> None:
     parser.add_argument("--out", default="out/bench_results.json", help="Path to JSON results")
     parser.add_argument("--csv", default="out/bench_results.csv", help="Path to CSV results")
     parser.add_argument("--verbose", action="store_true", help="Enable verbose logging")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=min(4, os.cpu_count() or 1),
+        help="Cases analysed in parallel (1 = sequential)",
+    )
+    parser.add_argument(
+        "--processes",
+        action="store_true",
+        help="Run --jobs worker processes instead of threads",
+    )
     args = parser.parse_args()
 
     cfg_data = _load_config(args.config) if os.path.isfile(args.config) else {}
@@ -315,11 +417,13 @@ def main() -> None:
     comp_cases_cfg = cfg_data.get("compressor_cases", [])
     cmp_cases_cfg = cfg_data.get("compare_cases", [])
 
-    cases: List[BenchCase] = []
-    cases.extend(run_thd_cases(cfg, thd_cases_cfg, args.verbose))
-    cases.extend(run_attack_release_cases(cfg, ar_cases_cfg, args.verbose))
-    cases.extend(run_compressor_cases(cfg, comp_cases_cfg, args.verbose))
-    cases.extend(run_compare_cases(cfg, cmp_cases_cfg, args.verbose))
+    # One pool over every category, so a short category never idles workers
+    tasks: List[Tuple[CaseRunner, Dict[str, Any]]] = []
+    tasks.extend((_thd_case, entry) for entry in thd_cases_cfg)
+    tasks.extend((_attack_release_case, entry) for entry in ar_cases_cfg)
+    tasks.extend((_compressor_case, entry) for entry in comp_cases_cfg)
+    tasks.extend((_compare_case, entry) for entry in cmp_cases_cfg)
+    cases = _run_tasks(tasks, cfg, args.verbose, args.jobs, processes=args.processes)
 
     write_outputs(cases, args.out, args.csv)
     print(f"Wrote results to {args.out} and {args.csv}")
@@ -1,17 +1,72 @@
+import collections
 import threading
-from typing import Callable
+import time
+from typing import Any, Callable, Optional
 
 class UILogger:
-    """Thread-safe logger that forwards messages to a UI callback."""
+    """Thread-safe logger that forwards messages to a UI callback.
 
-    def __init__(self, callback: Callable[[str], None]):
+    When ``schedule`` is given (e.g. ``root.after_idle``) messages are queued
+    and handed to the callback as one newline-joined batch per flush. With
+    ``timestamps`` each line is prefixed with the seconds since the logger was
+    created; the clock is read with ``monotonic_ns`` and only formatted at
+    flush time. ``maxlen`` bounds the queue: if the UI falls behind, the
+    oldest lines are dropped and a single notice replaces them.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[[str], None],
+        schedule: Optional[Callable[[Callable[[], None]], Any]] = None,
+        timestamps: bool = False,
+        maxlen: Optional[int] = None,
+    ):
         self.callback = callback
+        self.schedule = schedule
+        self.timestamps = timestamps
+        self._t0 = time.monotonic_ns()
         self._lock = threading.Lock()
+        self._pending = collections.deque(maxlen=maxlen)
+        self._dropped = 0
+        self._flush_scheduled = False
 
     def log(self, message: str) -> None:
+        # Attribute reads are atomic; with no callback there is nothing to
+        # serialize or queue, so skip the lock entirely.
+        callback = self.callback
+        if not callback:
+            return
+        stamp = time.monotonic_ns() if self.timestamps else None
+        if self.schedule is None:
+            with self._lock:
+                callback(self._format(stamp, message))
+            return
+        with self._lock:
+            if len(self._pending) == self._pending.maxlen:
+                self._dropped += 1
+            self._pending.append((stamp, message))
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
+        self.schedule(self.flush_pending)
+
+    def flush_pending(self) -> None:
+        """Deliver all queued messages to the callback in a single call."""
         with self._lock:
-            if self.callback:
-                self.callback(message)
+            batch = list(self._pending)
+            self._pending.clear()
+            dropped, self._dropped = self._dropped, 0
+            self._flush_scheduled = False
+        if batch and self.callback:
+            lines = [self._format(stamp, msg) for stamp, msg in batch]
+            if dropped:
+                lines.insert(0, f"[WARN] {dropped} log lines dropped")
+            self.callback("\n".join(lines))
+
+    def _format(self, stamp: Optional[int], message: str) -> str:
+        if stamp is None:
+            return message
+        return "[{:.3f}] {}".format((stamp - self._t0) / 1e9, message)
 
     def banner(self, message: str) -> None:
         self.log(f"[==] {message}")
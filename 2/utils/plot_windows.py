@@ -1,4 +1,8 @@
+import collections
+import csv
 import datetime
+import itertools
+import threading
 import tkinter as tk
 from tkinter import filedialog, ttk
 from typing import Callable, Dict, List, Optional, Sequence, Tuple
@@ -7,62 +11,265 @@ import numpy as np
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.figure import Figure
 
+from analysis import attack_release
+from utils.threading import run_in_thread
+
+
+EXPORT_BUFFER_BYTES = 1 << 20
+WORKER_POLL_MS = 30  # how often the Tk thread checks a background computation
+MAX_HARMONIC_LABELS = 10  # THD snapshot harmonics that get a text label
+
+
+def _write_csv_rows(path: str, header: Sequence[str], rows) -> None:
+    """Write ``header`` plus ``rows`` in one ``writerows`` pass through a 1 MB buffer."""
+    with open(path, "w", newline="", buffering=EXPORT_BUFFER_BYTES) as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        w.writerows(rows)
+
+
+def _write_float_csv(path: str, header: Sequence[str], *arrays, fmt: str = "%.9g") -> None:
+    """Numeric columns as ``fmt`` text; ``%.9g`` round-trips float32 exactly.
+
+    Rows are formatted with one ``%`` per row from C-level ``map``/``join`` instead
+    of a csv.writer call; lines end like the csv module's default dialect.
+    """
+    row_fmt = ",".join([fmt] * len(arrays))
+    terminator = csv.excel.lineterminator
+    with open(path, "w", newline="", buffering=EXPORT_BUFFER_BYTES) as f:
+        f.write(",".join(header) + terminator)
+        body = terminator.join(map(row_fmt.__mod__, zip(*_columns(*arrays))))
+        if body:
+            f.write(body + terminator)
+
+
+def _columns(*arrays) -> List[list]:
+    """Arrays as Python float lists (``tolist`` converts in C, same values as ``float()``).
+
+    Float arrays (float32 spectra/envelopes included) are converted directly;
+    only non-float input is cast first, so there is no float64 staging copy.
+    """
+    cols = []
+    for a in arrays:
+        a = np.asarray(a)
+        if a.dtype.kind != "f":
+            a = a.astype(np.float64)
+        cols.append(a.tolist())
+    return cols
+
+
+def _nearest_indices(grid: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """Index of the closest ``grid`` point (ascending grid) for every target; ties go low."""
+    grid = np.asarray(grid)
+    if len(grid) < 2:
+        return np.zeros(len(targets), dtype=np.intp)
+    idx = np.clip(np.searchsorted(grid, targets), 1, len(grid) - 1)
+    pick_right = (targets - grid[idx - 1]) > (grid[idx] - targets)
+    return np.where(pick_right, idx, idx - 1)
+
+
+def _median_inplace(a: np.ndarray) -> float:
+    """``np.median`` of a scratch array, partitioned in place instead of copied."""
+    if not a.size:
+        return float("nan")
+    k = a.size // 2
+    if a.size % 2:
+        a.partition(k)
+        return float(a[k])
+    a.partition((k - 1, k))
+    return float(np.mean(a[k - 1 : k + 1]))
+
+
+def _minmax_decimate(sig: np.ndarray, target: int = 4000) -> Tuple[np.ndarray, np.ndarray]:
+    """Min/max envelope of ``sig`` in at most ``target`` points, plus sample positions.
+
+    Each block of samples becomes its min and max, so a line plot a few
+    hundred pixels wide looks the same as the full-resolution trace.
+    """
+    n = len(sig)
+    if n <= target:
+        return np.arange(n, dtype=np.float32), sig
+    block = -(-n // (target // 2))
+    n_blocks = -(-n // block)
+    blocks = np.pad(sig, (0, n_blocks * block - n), mode="edge").reshape(n_blocks, block)
+    values = np.stack([blocks.min(axis=1), blocks.max(axis=1)], axis=1).ravel()
+    pos = np.repeat(np.arange(n_blocks, dtype=np.float32) * block, 2)
+    return pos, values
+
+
+class _SnapshotWindow:
+    """Toplevel + figure + axes of one snapshot; pooled per kind once closed."""
+
+    def __init__(
+        self, kind: str, top: tk.Toplevel, fig: Figure, canvas: FigureCanvasTkAgg, axes: List, export_btn, info
+    ):
+        self.kind = kind
+        self.top = top
+        self.fig = fig
+        self.canvas = canvas
+        self.axes = axes
+        self.export_btn = export_btn
+        # Tk label for long per-snapshot details, rendered by Tk instead of
+        # being typeset (and re-measured by the layout) in the figure
+        self.info = info
+        # (axes, title) shown in saved PNGs in place of the short on-screen title
+        self.png_title: Optional[Tuple[object, str]] = None
+        # Main data lines, kept across reuses and updated with set_data
+        self.lines: Dict[str, object] = {}
+        self.texts: Dict[str, object] = {}
+        # Set when the window closes so a background computation is dropped
+        self.pending: Optional[threading.Event] = None
+
+    def clear_annotations(self) -> None:
+        """Drop per-snapshot artists and legends; hide the kept lines, markers and texts."""
+        self.info.configure(text="")
+        self.png_title = None
+        kept = {*self.lines.values(), *self.texts.values()}
+        for ax in self.axes:
+            for artist in [*ax.lines, *ax.texts]:
+                if artist in kept:
+                    artist.set_visible(False)
+                else:
+                    artist.remove()
+            legend = ax.get_legend()
+            if legend is not None:
+                legend.remove()
+            ax.relim(visible_only=True)
+
+    def line(self, key: str, ax, x, y, **style):
+        """Show ``(x, y)`` on the kept line ``key``, creating it on first use."""
+        line = self.lines.get(key)
+        if line is None:
+            (line,) = ax.plot(x, y, **style)
+            self.lines[key] = line
+            return line
+        line.set_data(x, y)
+        line.set(visible=True, **style)
+        ax.relim(visible_only=True)
+        ax.autoscale_view()
+        return line
+
+    def vline(self, key: str, ax, x: float, **style):
+        """Kept ``axvline`` marker ``key`` moved to ``x`` (created on first use)."""
+        line = self.lines.get(key)
+        if line is None:
+            line = self.lines[key] = ax.axvline(x, **style)
+            return line
+        line.set_xdata([x, x])
+        line.set(visible=True, **style)
+        return line
+
+    def text(self, key: str, ax, x: float, y: float, label: str, **style):
+        """Kept text artist ``key`` moved to ``(x, y)`` (created on first use)."""
+        text = self.texts.get(key)
+        if text is None:
+            text = self.texts[key] = ax.text(x, y, label, **style)
+            return text
+        text.set_position((x, y))
+        text.set_text(label)
+        text.set(visible=True, **style)
+        return text
+
 
 class PlotWindowManager:
-    """Manage snapshot-style matplotlib windows embedded in Tk Toplevels."""
+    """Manage snapshot-style matplotlib windows embedded in Tk Toplevels.
+
+    Closed windows are withdrawn and kept (up to ``pool_size`` per snapshot
+    kind); the next snapshot of that kind reuses their axes instead of
+    building a new Toplevel, Figure and Tk canvas. Data lines, marker lines
+    and their labels are updated in place; only legends are rebuilt.
+    """
 
-    def __init__(self, root: tk.Tk, max_windows: int = 10, log: Optional[Callable[[str], None]] = None):
+    def __init__(
+        self,
+        root: tk.Tk,
+        max_windows: int = 10,
+        log: Optional[Callable[[str], None]] = None,
+        pool_size: int = 2,
+    ):
         self.root = root
         self.max_windows = max_windows
         self.log = log
-        self.windows: List[Tuple[tk.Toplevel, Figure]] = []
+        self.pool_size = pool_size
+        # Open windows in opening order (id -> window): O(1) close and FIFO trim
+        self.windows: "collections.OrderedDict[int, _SnapshotWindow]" = collections.OrderedDict()
+        self._pool: Dict[str, List[_SnapshotWindow]] = {}
 
     # -----------------------------------------------------
     def _log(self, msg: str):
         if self.log:
             self.log(msg)
 
-    def _close_window(self, top: tk.Toplevel, fig: Figure):
+    def _close_window(self, win: _SnapshotWindow):
+        self.windows.pop(id(win), None)
+        if win.pending is not None:
+            win.pending.set()
+            win.pending = None
+        pool = self._pool.setdefault(win.kind, [])
         try:
-            if fig:
-                fig.clf()
-            top.destroy()
+            if len(pool) < self.pool_size:
+                win.top.withdraw()
+                pool.append(win)
+                return
+            win.fig.clf()
+            win.top.destroy()
         except Exception:
             pass
-        self.windows = [(t, f) for (t, f) in self.windows if t != top]
-
-    def _register(self, top: tk.Toplevel, fig: Figure):
-        self.windows.append((top, fig))
-        top.protocol("WM_DELETE_WINDOW", lambda t=top, f=fig: self._close_window(t, f))
 
     def _maybe_trim_windows(self):
         if len(self.windows) >= self.max_windows:
-            oldest_top, oldest_fig = self.windows.pop(0)
+            oldest = next(iter(self.windows.values()))
             self._log("Đã đóng snapshot cũ để giải phóng bộ nhớ (tối đa %d cửa sổ)." % self.max_windows)
-            self._close_window(oldest_top, oldest_fig)
+            self._close_window(oldest)
 
-    def _create_window(self, title: str) -> Tuple[tk.Toplevel, Figure, FigureCanvasTkAgg, ttk.Frame]:
+    def _create_window(self, title: str, kind: str, nrows: int = 1) -> _SnapshotWindow:
         self._maybe_trim_windows()
-        top = tk.Toplevel(self.root)
-        top.title(title)
-        fig = Figure(figsize=(9, 6))
-        canvas = FigureCanvasTkAgg(fig, master=top)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
-
-        controls = ttk.Frame(top)
-        controls.pack(fill="x")
-        btn = ttk.Button(controls, text="Save PNG", command=lambda f=fig: self._save_png(f))
-        btn.pack(side="right", padx=6, pady=4)
-
-        self._register(top, fig)
-        return top, fig, canvas, controls
-
-    def _save_png(self, fig: Figure):
+        pool = self._pool.get(kind)
+        if pool:
+            win = pool.pop()
+            win.clear_annotations()
+            win.top.title(title)
+            win.top.deiconify()
+        else:
+            top = tk.Toplevel(self.root)
+            top.title(title)
+            # tight layout runs inside each (idle) draw instead of as a separate
+            # text-measuring pass before it; resizes are re-laid out as well
+            fig = Figure(figsize=(9, 6), tight_layout=True)
+            canvas = FigureCanvasTkAgg(fig, master=top)
+            canvas.get_tk_widget().pack(fill="both", expand=True)
+            axes = [fig.add_subplot(nrows, 1, i + 1) for i in range(nrows)]
+
+            controls = ttk.Frame(top)
+            controls.pack(fill="x")
+            btn = ttk.Button(controls, text="Save PNG")
+            btn.pack(side="right", padx=6, pady=4)
+            export_btn = ttk.Button(controls, text="Export CSV")
+            export_btn.pack(side="right", padx=6, pady=4)
+            info = ttk.Label(controls, text="", justify="left")
+            info.pack(side="left", padx=6)
+
+            win = _SnapshotWindow(kind, top, fig, canvas, axes, export_btn, info)
+            btn.configure(command=lambda w=win: self._save_png(w))
+            top.protocol("WM_DELETE_WINDOW", lambda w=win: self._close_window(w))
+        self.windows[id(win)] = win
+        return win
+
+    def _save_png(self, win: _SnapshotWindow):
         path = filedialog.asksaveasfilename(defaultextension=".png", filetypes=[("PNG", "*.png"), ("All files", "*.*")])
-        if path:
-            fig.savefig(path, dpi=150, bbox_inches="tight")
-            self._log(f"Đã lưu hình: {path}")
+        if not path:
+            return
+        # The saved image is standalone, so it carries the full details title
+        ax, title = win.png_title or (None, None)
+        short = ax.get_title() if ax is not None else None
+        if ax is not None:
+            ax.set_title(title)
+        try:
+            win.fig.savefig(path, dpi=150, bbox_inches="tight")
+        finally:
+            if ax is not None:
+                ax.set_title(short)
+        self._log(f"Đã lưu hình: {path}")
 
     # -----------------------------------------------------
     def open_thd_snapshot(
@@ -72,16 +279,19 @@ class PlotWindowManager:
         metrics: Dict[str, float],
         freq: float,
         hmax: int,
+        max_labels: int = MAX_HARMONIC_LABELS,
     ):
+        """THD snapshot: marker lines for H1..H``hmax``, labels on the ``max_labels`` strongest."""
         title = f"THD Plot – {datetime.datetime.now().strftime('%H:%M:%S')}"
-        _, fig, canvas, controls = self._create_window(title)
-        ax_wave = fig.add_subplot(2, 1, 1)
-        ax_fft = fig.add_subplot(2, 1, 2)
+        win = self._create_window(title, "thd", nrows=2)
+        ax_wave, ax_fft = win.axes
 
-        sig = np.asarray(signal, dtype=np.float32).flatten()
+        sig = np.asarray(signal, dtype=np.float32).ravel()
         n_show = min(len(sig), int(fs * 0.05))
-        t = np.arange(n_show) / fs
-        ax_wave.plot(t * 1000.0, sig[:n_show])
+        # Own only the plotted snippet: capture buffers are reused, and
+        # flatten() used to copy the whole signal just to show 50 ms of it
+        pos, values = _minmax_decimate(sig[:n_show].copy())
+        win.line("wave", ax_wave, pos * (1000.0 / fs), values)
         ax_wave.set_title("Waveform (50 ms snippet)")
         ax_wave.set_xlabel("Time (ms)")
         ax_wave.set_ylabel("Amplitude")
@@ -89,16 +299,21 @@ class PlotWindowManager:
         freqs = metrics.get("freqs")
         spectrum = metrics.get("spectrum")
         if freqs is not None and spectrum is not None:
-            ax_fft.plot(freqs, spectrum, label="Magnitude (dB)")
+            # Min/max per block keeps every peak on screen; the line holds a few
+            # thousand float32 points instead of a float64 copy of every bin
+            pos, values = _minmax_decimate(np.asarray(spectrum, dtype=np.float32))
+            win.line("spectrum", ax_fft, np.asarray(freqs)[pos.astype(np.intp)], values, label="Magnitude (dB)")
             ax_fft.set_xlim(0, fs / 2)
             ax_fft.set_xlabel("Frequency (Hz)")
             ax_fft.set_ylabel("dBFS")
-            for h in range(1, hmax + 1):
-                hf = h * freq
-                idx = int(np.argmin(np.abs(freqs - hf)))
-                if idx < len(freqs):
-                    ax_fft.axvline(freqs[idx], color="red", linestyle="--", alpha=0.5)
-                    ax_fft.text(freqs[idx], spectrum[idx], f"H{h}", rotation=90, va="bottom", ha="center", fontsize=8)
+            marker_idx = _nearest_indices(freqs, np.arange(1, hmax + 1) * freq)
+            # Text is the expensive artist to lay out and rasterize: label only the
+            # strongest harmonics and leave the rest as plain marker lines
+            labelled = set(np.argsort(-np.asarray(spectrum)[marker_idx], kind="stable")[: max(0, max_labels)].tolist())
+            for h, idx in enumerate(marker_idx.tolist(), start=1):
+                win.vline(f"H{h}", ax_fft, freqs[idx], color="red", linestyle="--", alpha=0.5)
+                if h - 1 in labelled:
+                    win.text(f"H{h}", ax_fft, freqs[idx], spectrum[idx], f"H{h}", rotation=90, va="bottom", ha="center", fontsize=8)
             ax_fft.legend()
 
         thd_db = metrics.get("thd_db", float("nan"))
@@ -109,36 +324,36 @@ class PlotWindowManager:
             path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv"), ("All files", "*.*")])
             if not path or freqs is None or spectrum is None:
                 return
-            import csv
-
-            with open(path, "w", newline="") as f:
-                w = csv.writer(f)
-                w.writerow(["freq_hz", "spectrum_db"])
-                for f_hz, mag_db in zip(freqs, spectrum):
-                    w.writerow([float(f_hz), float(mag_db)])
+            _write_csv_rows(path, ["freq_hz", "spectrum_db"], zip(*_columns(freqs, spectrum)))
             self._log(f"Đã xuất CSV: {path}")
 
-        ttk.Button(controls, text="Export CSV", command=_export_csv).pack(side="right", padx=6, pady=4)
+        win.export_btn.configure(command=_export_csv)
 
-        fig.tight_layout()
-        canvas.draw()
+        win.canvas.draw_idle()
 
     # -----------------------------------------------------
     def open_compressor_snapshot(self, curves: Sequence[Tuple[str, Dict[str, np.ndarray]]]):
         title = f"Compressor Curve – {datetime.datetime.now().strftime('%H:%M:%S')}"
-        _, fig, canvas, controls = self._create_window(title)
-        ax = fig.add_subplot(1, 1, 1)
+        win = self._create_window(title, "compressor")
+        (ax,) = win.axes
 
         colors = ["C0", "C1", "C2", "C3"]
+        # One pass over the curve dicts into parallel arrays, reused below
+        labels, xs, ys, styles = [], [], [], []
         for idx, (label, curve) in enumerate(curves):
             x = curve.get("in_db")
             y = curve.get("out_db")
             if x is None or y is None:
                 continue
-            ax.plot(x, y, marker="o", linestyle="-", label=label, color=colors[idx % len(colors)])
-
-        min_x = min([np.min(c[1].get("in_db")) for c in curves if c[1].get("in_db") is not None], default=-60)
-        max_x = max([np.max(c[1].get("in_db")) for c in curves if c[1].get("in_db") is not None], default=0)
+            labels.append(label)
+            xs.append(np.asarray(x, dtype=np.float64))
+            ys.append(np.asarray(y, dtype=np.float64))
+            styles.append(colors[idx % len(colors)])
+        for label, x, y, color in zip(labels, xs, ys, styles):
+            ax.plot(x, y, marker="o", linestyle="-", label=label, color=color)
+
+        all_x = np.concatenate(xs) if xs else np.empty(0)
+        min_x, max_x = (float(all_x.min()), float(all_x.max())) if all_x.size else (-60.0, 0.0)
         ax.plot([min_x, max_x], [min_x, max_x], linestyle="--", color="gray", label="Unity")
         ax.set_xlabel("Input RMS (dBFS)")
         ax.set_ylabel("Output RMS (dBFS)")
@@ -155,59 +370,46 @@ class PlotWindowManager:
                 subtitle.append(f"{label}: passthrough (gain {makeup:+.2f} dB)")
             else:
                 subtitle.append(f"{label}: Thr {thr:.2f} dB, Ratio {ratio:.2f}, Gain {makeup:+.2f} dB")
-        ax.set_title(" | ".join(subtitle))
+        ax.set_title(" | ".join(str(label) for label, _ in curves))
+        win.info.configure(text="\n".join(subtitle))
+        win.png_title = (ax, " | ".join(subtitle))
 
         def _export_csv():
             path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv"), ("All files", "*.*")])
             if not path:
                 return
-            import csv
-
-            with open(path, "w", newline="") as f:
-                w = csv.writer(f)
-                headers = ["label", "input_db", "output_db"]
-                w.writerow(headers)
-                for label, curve in curves:
-                    x = curve.get("in_db")
-                    y = curve.get("out_db")
-                    if x is None or y is None:
-                        continue
-                    for xi, yi in zip(x, y):
-                        w.writerow([label, float(xi), float(yi)])
+            rows = (zip(itertools.repeat(label), x.tolist(), y.tolist()) for label, x, y in zip(labels, xs, ys))
+            _write_csv_rows(path, ["label", "input_db", "output_db"], itertools.chain.from_iterable(rows))
             self._log(f"Đã xuất CSV: {path}")
 
-        ttk.Button(controls, text="Export CSV", command=_export_csv).pack(side="right", padx=6, pady=4)
+        win.export_btn.configure(command=_export_csv)
 
-        fig.tight_layout()
-        canvas.draw()
+        win.canvas.draw_idle()
 
     # -----------------------------------------------------
     def open_ar_snapshot(self, signal: np.ndarray, fs: int, rms_win: float, metrics: Dict[str, float]):
         title = f"Attack/Release – {datetime.datetime.now().strftime('%H:%M:%S')}"
-        _, fig, canvas, controls = self._create_window(title)
-        ax_wave = fig.add_subplot(2, 1, 1)
-        ax_env = fig.add_subplot(2, 1, 2)
+        win = self._create_window(title, "ar", nrows=2)
+        ax_wave, ax_env = win.axes
 
+        # flatten() copies: the envelope worker and the plot must not see a
+        # capture buffer that the next measurement overwrites
         sig = np.asarray(signal, dtype=np.float32).flatten()
-        t = np.arange(len(sig)) / fs
-        ax_wave.plot(t, sig)
+        pos, values = _minmax_decimate(sig)
+        win.line("wave", ax_wave, pos / fs, values)
         ax_wave.set_title("Waveform")
         ax_wave.set_xlabel("Time (s)")
         ax_wave.set_ylabel("Amplitude")
 
-        # Envelope and markers
-        from analysis import attack_release  # Local import to avoid circular
-
-        env = attack_release.envelope_rms(sig, fs, rms_win)
-        env_t = np.arange(len(env)) / fs
-        ax_env.plot(env_t, env, label="RMS envelope")
-
+        # Envelope and markers are computed on a worker thread; the Tk thread
+        # polls for the result and finishes the plot (Tk is not thread-safe).
         def _find_markers(env_arr: np.ndarray):
             n = len(env_arr)
             q1, q3 = n // 4, 3 * n // 4
-            low = float(np.median(env_arr[:q1]))
-            high = float(np.median(env_arr[q1:q3]))
-            tail = float(np.median(env_arr[q3:]))
+            work = np.array(env_arr)  # one scratch copy; the slices are disjoint
+            low = _median_inplace(work[:q1])
+            high = _median_inplace(work[q1:q3])
+            tail = _median_inplace(work[q3:])
             atk_start_lvl = low + 0.1 * (high - low)
             atk_end_lvl = low + 0.9 * (high - low)
             rel_start_lvl = high - 0.1 * (high - tail)
@@ -215,14 +417,10 @@ class PlotWindowManager:
             rise = env_arr[q1 - n // 10 : q3]
             fall = env_arr[q3 - n // 10 :]
 
-            def _crossing(x: np.ndarray, level: float, direction: str = "up"):
-                idxs = np.nonzero(x >= level)[0] if direction == "up" else np.nonzero(x <= level)[0]
-                return int(idxs[0]) if idxs.size else None
-
-            atk_start_rel = _crossing(rise, atk_start_lvl, "up")
-            atk_end_rel = _crossing(rise, atk_end_lvl, "up")
-            rel_start_rel = _crossing(fall, rel_start_lvl, "down")
-            rel_end_rel = _crossing(fall, rel_end_lvl, "down")
+            atk_start_rel = attack_release.first_crossing(rise, atk_start_lvl, "up")
+            atk_end_rel = attack_release.first_crossing(rise, atk_end_lvl, "up")
+            rel_start_rel = attack_release.first_crossing(fall, rel_start_lvl, "down")
+            rel_end_rel = attack_release.first_crossing(fall, rel_end_lvl, "down")
 
             markers = {}
             if atk_start_rel is not None:
@@ -235,33 +433,62 @@ class PlotWindowManager:
                 markers["rel_end"] = (q3 - n // 10 + rel_end_rel) / fs
             return markers
 
-        markers = _find_markers(env)
-        for key, xt in markers.items():
-            ax_env.axvline(xt, color="red", linestyle="--", alpha=0.6)
-            ax_env.text(xt, max(env) * 0.8, key, rotation=90, va="bottom", ha="center", fontsize=8)
-
         ax_env.set_xlabel("Time (s)")
         ax_env.set_ylabel("RMS")
-        ax_env.set_title(
-            f"Attack {metrics.get('attack_ms', float('nan')):.1f} ms | Release {metrics.get('release_ms', float('nan')):.1f} ms"
-        )
-        ax_env.legend()
-
-        def _export_csv():
-            path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv"), ("All files", "*.*")])
-            if not path:
+        ax_env.set_title("Computing envelope…")
+        win.export_btn.state(["disabled"])
+
+        result: Dict[str, object] = {}
+
+        def _compute():
+            try:
+                env = attack_release.envelope_rms(sig, fs, rms_win)
+                result["markers"] = _find_markers(env)
+                result["env"] = env
+            except Exception as exc:
+                result["error"] = exc
+
+        def _finish():
+            if "error" in result:
+                ax_env.set_title("Envelope unavailable")
+                win.canvas.draw_idle()
+                self._log(f"Lỗi tính envelope: {result['error']}")
                 return
-            import csv
-
-            with open(path, "w", newline="") as f:
-                w = csv.writer(f)
-                w.writerow(["time_s", "envelope"])
-                for tt, vv in zip(env_t, env):
-                    w.writerow([float(tt), float(vv)])
-            self._log(f"Đã xuất CSV: {path}")
-
-        ttk.Button(controls, text="Export CSV", command=_export_csv).pack(side="right", padx=6, pady=4)
+            env = result["env"]
+            # float32 is plenty for screen positions; the export rebuilds float64 times
+            env_t = np.arange(len(env), dtype=np.float32) / np.float32(fs)
+            win.line("envelope", ax_env, env_t, env, label="RMS envelope")
+            text_y = float(np.max(env)) * 0.8 if len(env) else 0.0
+            for key, xt in result["markers"].items():
+                win.vline(key, ax_env, xt, color="red", linestyle="--", alpha=0.6)
+                win.text(key, ax_env, xt, text_y, key, rotation=90, va="bottom", ha="center", fontsize=8)
+            ax_env.set_title(
+                f"Attack {metrics.get('attack_ms', float('nan')):.1f} ms | Release {metrics.get('release_ms', float('nan')):.1f} ms"
+            )
+            ax_env.legend()
+
+            def _export_csv():
+                path = filedialog.asksaveasfilename(defaultextension=".csv", filetypes=[("CSV", "*.csv"), ("All files", "*.*")])
+                if not path:
+                    return
+                _write_float_csv(path, ["time_s", "envelope"], np.arange(len(env)) / fs, env)
+                self._log(f"Đã xuất CSV: {path}")
+
+            win.export_btn.configure(command=_export_csv)
+            win.export_btn.state(["!disabled"])
+            win.canvas.draw_idle()
+
+        win.pending = threading.Event()
+        worker = run_in_thread(_compute, win.pending, name="ar_envelope")
+
+        def _poll(stop=win.pending):
+            if stop.is_set():  # window closed (or pooled and reused) meanwhile
+                return
+            if not worker.done():
+                self.root.after(WORKER_POLL_MS, _poll)
+                return
+            _finish()
 
-        fig.tight_layout()
-        canvas.draw()
+        win.canvas.draw_idle()
+        self.root.after(WORKER_POLL_MS, _poll)
 
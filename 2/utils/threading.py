@@ -1,11 +1,23 @@
+import concurrent.futures
 import threading
 from typing import Callable, Optional
 
+# Shared by every background task: workers are created once and reused, and
+# a burst of requests queues instead of spawning one OS thread each.
+BACKGROUND_WORKERS = 4
+_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=BACKGROUND_WORKERS, thread_name_prefix="g2_bg")
 
-def run_in_thread(target: Callable, stop_event: threading.Event, name: Optional[str] = None) -> threading.Thread:
-    """Launch a target in a background daemon thread."""
-    thread = threading.Thread(target=target, name=name or target.__name__)
-    thread.daemon = True
+
+def run_in_thread(
+    target: Callable, stop_event: threading.Event, name: Optional[str] = None, *args, **kwargs
+) -> concurrent.futures.Future:
+    """Run ``target(*args, **kwargs)`` on the shared background pool.
+
+    ``stop_event`` is cleared before the task is queued, as before. Returns the
+    task's ``Future`` (``done()`` / ``result(timeout)`` replace ``is_alive`` /
+    ``join``); ``name`` is kept on it as ``future.name`` for logging.
+    """
     stop_event.clear()
-    thread.start()
-    return thread
+    future = _POOL.submit(target, *args, **kwargs)
+    future.name = name or getattr(target, "__name__", "task")
+    return future